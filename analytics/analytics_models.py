@@ -0,0 +1,32 @@
+from datetime import date
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class DestinationCount(BaseModel):
+    """Number of plans generated for a destination"""
+    location: str
+    plans: int
+    average_trip_length: float = Field(..., description="average number of days of plans to this destination")
+
+
+class DailyPlanCount(BaseModel):
+    """Number of plans generated on a day"""
+    day: date
+    plans: int
+
+
+class LanguageCount(BaseModel):
+    """Number of plans generated in a language"""
+    language: str
+    plans: int
+
+
+class PlanAnalytics(BaseModel):
+    """Admin dashboard figures, read from the precomputed plan_analytics buckets"""
+    total_plans: int
+    average_trip_length: float
+    top_destinations: List[DestinationCount]
+    plans_per_day: List[DailyPlanCount]
+    language_mix: List[LanguageCount]
+    computed_until: Optional[str] = Field(default=None, description="_id of the newest plan included in the figures")
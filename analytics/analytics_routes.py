@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from utils.commons import to_json_response, PydanticJSONResponse
+from auth.auth_models import AuthenticatedUser
+from auth.auth_middleware import auth_middleware
+from .analytics_service import analytics_service
+
+
+analytics_router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"], default_response_class=PydanticJSONResponse)
+
+@analytics_router.get("/plans")
+async def get_plan_analytics(
+    top: int = Query(default=10, ge=1, le=100),
+    days: int = Query(default=30, ge=1, le=366),
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin()),
+):
+    """Top destinations, plans per day, average trip length and language mix (admin only)"""
+    result = await analytics_service.get_plan_analytics(top, days)
+    return to_json_response(result)
+
+@analytics_router.post("/plans/refresh")
+async def refresh_plan_analytics(current_user: AuthenticatedUser = Depends(auth_middleware.require_admin())):
+    """Fold plans created since the last refresh into the analytics (admin only)"""
+    result = await analytics_service.refresh_plan_analytics()
+    return to_json_response(result)
@@ -0,0 +1,351 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+
+from models.api_responses import SuccessResponse
+from models.status_code import sc
+from models.travel_models import PlanStatus
+from mongo_collection_names import CollectionNames
+from travel_bot_exception import TravelBotException
+from utils.config import settings
+from utils.logger import logger
+from utils.mongo_db_manager import mongodb_manager, MongoProfile
+from .analytics_models import PlanAnalytics, DestinationCount, DailyPlanCount, LanguageCount
+
+# Bucket dimensions of the plan_analytics collection. Every bucket document is
+# {_id: {dimension, key}, plans, total_days, through, late_through}, so
+# dashboard reads touch one document per bucket instead of one per plan.
+# `through` is the last _id window and `late_through` the last late batch
+# merged into the bucket.
+DESTINATION = "destination"
+DAY = "day"
+LANGUAGE = "language"
+TOTAL = "total"
+
+# plans the summary backfill has not reached yet are counted from their request
+_DIMENSION_KEYS: Dict[str, Any] = {
+    DESTINATION: {"$ifNull": ["$summary.location", "$request.location"]},
+    DAY: {"$dateToString": {"format": "%Y-%m-%d", "date": {"$toDate": "$_id"}}},
+    LANGUAGE: {"$ifNull": ["$summary.language", {"$ifNull": ["$request.preferred_language", "unknown"]}]},
+    TOTAL: {"$literal": "all"},
+}
+_NUMBER_OF_DAYS = {"$ifNull": ["$summary.number_of_days", "$request.number_of_days"]}
+
+_WATERMARK_ID = "plan_analytics"
+# bumped when buckets must be rebuilt from every plan; 2 counts plans without a summary
+_BUCKET_VERSION = 2
+_LEASE_ID = "plan_analytics_lease"
+
+
+class AnalyticsService:
+    """
+    Maintains the plan_analytics materialized view incrementally. Each refresh
+    aggregates only the plans added since the stored watermark and $merges the
+    partial counts into the existing buckets.
+
+    The additive merges must not overlap: one refresh runs at a time, under a
+    lock within the process and a lease document across instances. A run is
+    also safe to repeat. Its window is saved before merging and reused if the
+    run fails part way, and a bucket skips a window it has already merged.
+
+    Plans stored under an _id the watermark has already passed (a reservation
+    that expired before its plan was written) carry analytics_late and are
+    merged in separate late batches, with the same resume rules.
+    """
+
+    def __init__(self):
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+        self._lease_owner = uuid.uuid4().hex
+
+    def start_refresh_job(self) -> None:
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop_refresh_job(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Plan analytics refresh failed: {str(e)}")
+            await asyncio.sleep(settings.ANALYTICS_REFRESH_SECONDS)
+
+    async def refresh(self) -> bool:
+        """
+        Fold plans newer than the watermark into the analytics buckets.
+        Returns False when another instance holds the refresh lease.
+        """
+        async with self._refresh_lock:
+            if not await self._acquire_lease():
+                logger.info("Plan analytics refresh skipped, another instance is refreshing")
+                return False
+            try:
+                await self._refresh()
+            finally:
+                await self._release_lease()
+        return True
+
+    async def _refresh(self) -> None:
+        checkpoint = await self._load_checkpoint()
+        if checkpoint.get("version") != _BUCKET_VERSION:
+            checkpoint = await self._reset_buckets()
+        watermark = checkpoint.get("last_id")
+        if watermark is not None:
+            await self._merge_late_plans(watermark, checkpoint.get("pending_late_batch"))
+        await self._merge_new_plans(watermark, checkpoint.get("pending_until"))
+
+    async def _merge_new_plans(self, watermark: Optional[ObjectId], newest_id: Optional[ObjectId]) -> None:
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
+        id_window: Dict[str, Any] = {}
+        if watermark is not None:
+            id_window["$gt"] = watermark
+        match = {
+            "_id": id_window,
+            "status": {"$ne": PlanStatus.PENDING.value},
+        }
+
+        if newest_id is None:
+            id_window["$lt"] = await self._get_upper_bound()
+            newest = await travel_collection.find(match, projection={"_id": 1}) \
+                .sort("_id", DESCENDING) \
+                .limit(1) \
+                .to_list(length=1)
+            if not newest:
+                return
+            newest_id = newest[0]["_id"]
+            del id_window["$lt"]
+            # saved before merging so a failed run retries this exact window
+            await self._update_checkpoint({"pending_until": newest_id})
+        else:
+            logger.info(f"Resuming plan analytics refresh up to _id={newest_id}")
+
+        # pin the window to the newest plan so the saved watermark matches exactly what was merged
+        id_window["$lte"] = newest_id
+
+        for dimension, key in _DIMENSION_KEYS.items():
+            await travel_collection.aggregate(
+                self._merge_pipeline(match, dimension, key, "through", newest_id)
+            ).to_list(length=None)
+
+        # late plans inside this window were just counted with it
+        await travel_collection.update_many(
+            {"_id": id_window, "analytics_late": {"$exists": True}},
+            {"$unset": {"analytics_late": ""}},
+        )
+        await self._save_watermark(newest_id)
+        logger.info(f"Plan analytics refreshed up to _id={newest_id}")
+
+    async def _merge_late_plans(self, watermark: ObjectId, batch_id: Optional[ObjectId]) -> None:
+        """Merge plans stored at or below the watermark after it had passed them."""
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
+        if batch_id is None:
+            batch_id = ObjectId()
+            # saved before tagging so a failed run finishes this exact batch
+            await self._update_checkpoint({"pending_late_batch": batch_id})
+            await travel_collection.update_many(
+                {"analytics_late": True, "_id": {"$lte": watermark}},
+                {"$set": {"analytics_late": batch_id}},
+            )
+
+        match = {"analytics_late": batch_id}
+        for dimension, key in _DIMENSION_KEYS.items():
+            await travel_collection.aggregate(
+                self._merge_pipeline(match, dimension, key, "late_through", batch_id)
+            ).to_list(length=None)
+
+        result = await travel_collection.update_many(match, {"$unset": {"analytics_late": ""}})
+        await self._update_checkpoint({}, unset="pending_late_batch")
+        if result.modified_count:
+            logger.info(f"Plan analytics merged {result.modified_count} late plan(s)")
+
+    async def _reset_buckets(self) -> Dict[str, Any]:
+        """
+        Drop the buckets and the watermark so the next window re-aggregates
+        every plan. Runs once after _BUCKET_VERSION changes.
+        """
+        logger.info(f"Rebuilding plan analytics buckets for version {_BUCKET_VERSION}")
+        analytics = mongodb_manager.get_collection(CollectionNames.PLAN_ANALYTICS)
+        await analytics.delete_many({})
+        checkpoint = {"_id": _WATERMARK_ID, "version": _BUCKET_VERSION, "updated_at": datetime.now(timezone.utc)}
+        checkpoints = mongodb_manager.get_collection(CollectionNames.JOB_CHECKPOINTS)
+        await checkpoints.replace_one({"_id": _WATERMARK_ID}, checkpoint, upsert=True)
+        return checkpoint
+
+    def _merge_pipeline(
+        self, match: Dict[str, Any], dimension: str, key: Any, marker: str, marker_value: ObjectId
+    ) -> List[Dict[str, Any]]:
+        # a bucket whose marker already reached this window or batch was merged by an earlier attempt
+        merged = {"$gte": [f"${marker}", f"$$new.{marker}"]}
+        return [
+            {"$match": match},
+            {"$group": {
+                "_id": {"dimension": dimension, "key": key},
+                "plans": {"$sum": 1},
+                "total_days": {"$sum": _NUMBER_OF_DAYS},
+            }},
+            {"$set": {marker: {"$literal": marker_value}}},
+            {"$merge": {
+                "into": CollectionNames.PLAN_ANALYTICS,
+                "on": "_id",
+                "whenMatched": [{"$set": {
+                    "plans": {"$cond": [merged, "$plans", {"$add": ["$plans", "$$new.plans"]}]},
+                    "total_days": {"$cond": [merged, "$total_days", {"$add": ["$total_days", "$$new.total_days"]}]},
+                    marker: {"$cond": [merged, f"${marker}", f"$$new.{marker}"]},
+                }}],
+                "whenNotMatched": "insert",
+            }},
+        ]
+
+    async def _acquire_lease(self) -> bool:
+        """Take or extend the refresh lease; an expired lease of a crashed instance is taken over"""
+        checkpoints = mongodb_manager.get_collection(CollectionNames.JOB_CHECKPOINTS)
+        now = datetime.now(timezone.utc)
+        try:
+            await checkpoints.update_one(
+                {"_id": _LEASE_ID, "$or": [{"owner": self._lease_owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {
+                    "owner": self._lease_owner,
+                    "expires_at": now + timedelta(seconds=settings.ANALYTICS_REFRESH_LEASE_SECONDS),
+                }},
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            # the lease document exists and belongs to a live refresh elsewhere
+            return False
+
+    async def _release_lease(self) -> None:
+        try:
+            checkpoints = mongodb_manager.get_collection(CollectionNames.JOB_CHECKPOINTS)
+            await checkpoints.delete_one({"_id": _LEASE_ID, "owner": self._lease_owner})
+        except Exception as e:
+            # the lease expires on its own
+            logger.error(f"Failed to release the plan analytics lease: {str(e)}")
+
+    async def _get_upper_bound(self) -> Optional[ObjectId]:
+        """
+        Exclusive _id bound for a refresh. Stops at the oldest pending
+        reservation, because it may still complete after the watermark
+        has moved past it.
+        """
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
+        oldest_pending = await travel_collection.find_one(
+            {"status": PlanStatus.PENDING.value, "reserved_at": {"$exists": True}},
+            projection={"_id": 1},
+            sort=[("reserved_at", ASCENDING)],
+        )
+        if oldest_pending:
+            return oldest_pending["_id"]
+        # a generation time slightly in the future bounds every stored plan
+        return ObjectId.from_datetime(datetime.now(timezone.utc) + timedelta(seconds=1))
+
+    async def _load_checkpoint(self) -> Dict[str, Any]:
+        checkpoints = mongodb_manager.get_collection(CollectionNames.JOB_CHECKPOINTS)
+        return await checkpoints.find_one({"_id": _WATERMARK_ID}) or {}
+
+    async def _load_watermark(self) -> Optional[ObjectId]:
+        return (await self._load_checkpoint()).get("last_id")
+
+    async def _update_checkpoint(self, fields: Dict[str, Any], unset: Optional[str] = None) -> None:
+        checkpoints = mongodb_manager.get_collection(CollectionNames.JOB_CHECKPOINTS)
+        update: Dict[str, Any] = {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}}
+        if unset:
+            update["$unset"] = {unset: ""}
+        await checkpoints.update_one({"_id": _WATERMARK_ID}, update, upsert=True)
+
+    async def _save_watermark(self, last_id: ObjectId) -> None:
+        checkpoints = mongodb_manager.get_collection(CollectionNames.JOB_CHECKPOINTS)
+        await checkpoints.update_one(
+            {"_id": _WATERMARK_ID},
+            {
+                "$set": {"last_id": last_id, "updated_at": datetime.now(timezone.utc)},
+                "$unset": {"pending_until": ""},
+            },
+            upsert=True,
+        )
+
+    async def refresh_plan_analytics(self) -> SuccessResponse[Dict[str, Any]]:
+        try:
+            refreshed = await self.refresh()
+        except Exception as exc:
+            raise TravelBotException(
+                message="Failed to refresh plan analytics",
+                error_code=sc.INTERNAL_SERVER_ERROR,
+                original_exception=exc
+            )
+        if not refreshed:
+            raise TravelBotException(
+                message="Plan analytics refresh already running, retry shortly",
+                error_code=sc.CONFLICT
+            )
+
+        watermark = await self._load_watermark()
+        return SuccessResponse(
+            data={"message": "Plan analytics refreshed", "status": "success", "computed_until": str(watermark) if watermark else None},
+            status_code=sc.SUCCESS
+        )
+
+    async def get_plan_analytics(self, top: int, days: int) -> SuccessResponse[PlanAnalytics]:
+        try:
+            analytics = mongodb_manager.get_collection(CollectionNames.PLAN_ANALYTICS, MongoProfile.PLAN_READS)
+
+            total = await analytics.find_one({"_id": {"dimension": TOTAL, "key": "all"}}) or {}
+            total_plans = total.get("plans", 0)
+
+            destinations = await analytics.find({"_id.dimension": DESTINATION}) \
+                .sort("plans", DESCENDING) \
+                .limit(top) \
+                .to_list(length=top)
+
+            since = (date.today() - timedelta(days=days - 1)).isoformat()
+            daily = await analytics.find({"_id.dimension": DAY, "_id.key": {"$gte": since}}) \
+                .sort("_id.key", ASCENDING) \
+                .to_list(length=days)
+
+            languages = await analytics.find({"_id.dimension": LANGUAGE}) \
+                .sort("plans", DESCENDING) \
+                .to_list(length=None)
+
+            watermark = await self._load_watermark()
+
+            result = PlanAnalytics(
+                total_plans=total_plans,
+                average_trip_length=total.get("total_days", 0) / total_plans if total_plans else 0.0,
+                top_destinations=[
+                    DestinationCount(
+                        location=doc["_id"]["key"],
+                        plans=doc["plans"],
+                        average_trip_length=doc["total_days"] / doc["plans"],
+                    )
+                    for doc in destinations
+                ],
+                plans_per_day=[DailyPlanCount(day=doc["_id"]["key"], plans=doc["plans"]) for doc in daily],
+                language_mix=[LanguageCount(language=doc["_id"]["key"], plans=doc["plans"]) for doc in languages],
+                computed_until=str(watermark) if watermark else None,
+            )
+            return SuccessResponse(data=result, status_code=sc.SUCCESS)
+
+        except Exception as exc:
+            raise TravelBotException(
+                message="Failed to fetch plan analytics",
+                error_code=sc.INTERNAL_SERVER_ERROR,
+                original_exception=exc
+            )
+
+
+#Global instance
+analytics_service = AnalyticsService()
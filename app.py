@@ -10,12 +10,20 @@ from models.api_responses import ErrorResponse
 from models.status_code import sc
 from utils.config import settings
 from contextlib import asynccontextmanager
-from utils.logger import logger
+from utils.logger import logger, RequestIdMiddleware
 from travel_bot_exception import TravelBotException
 from utils.data_sources_manager import data_sources_manager
+from utils.health_prober import health_prober
+from utils.plan_outbox import plan_outbox
+from travel_bot_service import travelbot_service
 from datetime import datetime, timezone
 from travel_bot_router import travelbot_router
 from auth.auth_routes import auth_router
+from analytics.analytics_routes import analytics_router
+from analytics.analytics_service import analytics_service
+from utils import pdf_manager
+from auth import password_hasher
+from auth.token_denylist import token_denylist
 
 @asynccontextmanager
 async def lifespan_handler(app: FastAPI):
@@ -26,6 +34,14 @@ async def lifespan_handler(app: FastAPI):
     try:
         logger.info("Starting Travel Mate...")
         await data_sources_manager.connect_all()
+        await token_denylist.start()
+        # seed the cached health snapshot before serving traffic
+        await health_prober.probe()
+        health_prober.start()
+        if settings.PLAN_WRITE_BEHIND:
+            # replays plans that were accepted but not yet written before the last shutdown
+            await plan_outbox.start(travelbot_service.write_outbox_plans)
+        analytics_service.start_refresh_job()
         logger.info("Application startup completed successfully")
     except Exception as e:
         logger.error(f"Failed to start application: {str(e)}")
@@ -36,7 +52,13 @@ async def lifespan_handler(app: FastAPI):
     # Shutdown
     try:
         logger.info("Shutting down Travel Mate...")
+        await analytics_service.stop_refresh_job()
+        await health_prober.stop()
+        await token_denylist.stop()
+        await plan_outbox.stop()
         await data_sources_manager.disconnect_all()
+        pdf_manager.shutdown_process_pool()
+        password_hasher.shutdown_thread_pool()
         logger.info("Application shutdown completed successfully")
     except Exception as e:
         logger.error(f"Error during application shutdown: {str(e)}")
@@ -50,6 +72,9 @@ app = FastAPI(
 
 )
 
+# Tag every request (and its log lines) with an X-Request-ID
+app.add_middleware(RequestIdMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -101,6 +126,7 @@ async def generic_exception_handler(request: Request, exc: Exception):
 
 app.include_router(travelbot_router)
 app.include_router(auth_router)
+app.include_router(analytics_router)
 
 # Favicon endpoint to prevent 404 logs
 @app.get("/favicon.ico")
@@ -112,16 +138,22 @@ async def favicon():
 async def health_check():
     return {"status": "healthy", "service": "ai-quiz-bot-be", "version" : "1.0.0"}
 
+# Readiness endpoint: 503 until the database pools are connected and warm
+@app.get("/ready")
+async def readiness_check():
+    readiness = data_sources_manager.readiness()
+    status_code = sc.SUCCESS if readiness["ready"] else sc.DB_CONNECTION_ERROR
+    return JSONResponse(status_code=status_code, content=readiness)
+
 # Database health check endpoint
 @app.get("/health/database")
 async def database_health_check():
     """
-    Check the health of database connections
+    Report the health of database connections from the background prober's
+    cached snapshot. No database round trip happens on this path.
     """
     try:
-        logger.debug("Doing Health check on database connections...")
-
-        health_status = await data_sources_manager.health_check()
+        health_status = health_prober.snapshot()
         return {
             "service": "ai-health-coach-be",
             "version": "1.0.0",
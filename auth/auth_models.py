@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
+from datetime import datetime
 
 
 class SignUpRequest(BaseModel):
@@ -40,12 +41,41 @@ class AssignPermissionsRequest(BaseModel):
     permissions: List[str]
 
 
+class BulkAssignRolesRequest(BaseModel):
+    """Model for assigning roles to many users at once"""
+    assignments: List[AssignRolesRequest] = Field(..., max_length=50000)
+
+class BulkAssignPermissionsRequest(BaseModel):
+    """Model for assigning permissions to many users at once"""
+    assignments: List[AssignPermissionsRequest] = Field(..., max_length=50000)
+
+
+class UserDirectoryFilter(BaseModel):
+    """Filters of the admin user directory"""
+    role: Optional[str] = Field(default=None, description="only users holding this role")
+    email_prefix: Optional[str] = Field(default=None, min_length=1, description="only users whose email starts with this")
+
+class UserDirectoryEntry(BaseModel):
+    """A user as listed in the admin user directory; never carries the password hash"""
+    userId: int
+    firstName: str
+    lastName: str
+    email: str
+    roles: List[str] = []
+    permissions: List[str] = []
+    createdOn: Optional[datetime] = None
+
+class UserDirectoryPage(BaseModel):
+    users: List[UserDirectoryEntry] = Field(..., description="users in this page, in user_id order")
+    next_cursor: Optional[str] = Field(default=None, description="cursor for the next page, absent on the last page")
+
+
 class AppUser(BaseModel):
     """Model for app user"""
     firstName: str
     lastName: str
     email: EmailStr
     password: str
-    roles: Optional[str] = None
-    permissions: Optional[str] = None
+    roles: List[str] = []
+    permissions: List[str] = []
     social_login_ids: Optional[str] = None
@@ -1,19 +1,20 @@
 from datetime import datetime, timezone
 from sqlalchemy import create_engine, text
-from .auth_models import SignUpRequest,AppUser
+from .auth_models import SignUpRequest,AppUser, UserDirectoryEntry, UserDirectoryFilter
 from travel_bot_exception import TravelBotException
 from models.status_code import sc
 from utils.config import settings
-import bcrypt
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from utils.logger import logger
 from utils.postgre_db_manager import postgre_manager
+from . import password_hasher
 
-def _hash_password(password: str) -> str:
+async def _hash_password(password: str) -> str:
     try:
-        # Generate salt and hash password
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        # Hashed on the bcrypt thread pool, off the event loop
+        return await password_hasher.hash_password(password)
+    except TravelBotException:
+        raise
     except Exception as error:
         raise TravelBotException(
             message=f"Failed to hash password: {str(error)}",
@@ -22,29 +23,54 @@ def _hash_password(password: str) -> str:
         )
 
 
-async def create_user(signup_request: SignUpRequest,role:str) -> None:
+async def create_user(signup_request: SignUpRequest) -> Optional[str]:
+    """
+    Insert a new user in a single round trip and return the assigned role,
+    or None when the email is already registered.
+
+    The first signup, decided with an EXISTS check instead of a COUNT, claims
+    the single app_first_admin row and becomes admin. The claim's primary
+    key makes concurrent first signups wait on each other, so only one of
+    them can become admin.
+    """
     try:
         # Prepare SQL query to INSERT a new user
         insert_query = """
-            INSERT INTO app_user (first_name, last_name, email_id, password, roles, created_by, created_on, last_updated_by, last_updated_on)
-            VALUES (:firstName, :lastName, :email, :password, :roles, :createdBy, NOW(), :lastUpdatedBy, NOW());
+            WITH first_admin AS (
+                INSERT INTO app_first_admin (id)
+                SELECT TRUE WHERE NOT EXISTS (SELECT 1 FROM app_user)
+                ON CONFLICT (id) DO NOTHING
+                RETURNING id
+            ),
+            new_user AS (
+                INSERT INTO app_user (first_name, last_name, email_id, password, created_by, created_on, last_updated_by, last_updated_on)
+                VALUES (:firstName, :lastName, :email, :password, :createdBy, NOW(), :lastUpdatedBy, NOW())
+                ON CONFLICT (email_id) DO NOTHING
+                RETURNING user_id
+            )
+            INSERT INTO app_user_role (user_id, role)
+            SELECT user_id, CASE WHEN EXISTS (SELECT 1 FROM first_admin) THEN 'admin' ELSE 'user' END
+            FROM new_user
+            RETURNING role;
         """
 
         # Hash the password before storing
-        hashed_password = _hash_password(signup_request.password)
+        hashed_password = await _hash_password(signup_request.password)
 
         values = {
             'firstName': signup_request.firstName,
             'lastName': signup_request.lastName,
             'email': signup_request.email,
             'password': hashed_password,
-            'roles': role,
             'createdBy': 'system',
             'lastUpdatedBy': 'system'
         }
 
-        await postgre_manager.execute(query=insert_query, values=values)
+        record = await postgre_manager.fetch_one(query=insert_query, values=values)
+        return record['role'] if record else None
 
+    except TravelBotException:
+        raise
     except Exception as error:
         raise TravelBotException(
             message=f"Failed to create user: {str(error)}",
@@ -59,19 +85,18 @@ async def is_user_exists(email: str) -> bool:
     result =  await postgre_manager.fetch_one(query=query, values=params)
     return True if result and result[0] != 0 else False
 
-async def get_users_count() -> int:
-    query = "SELECT COUNT('x') FROM app_user"
-    result = await postgre_manager.fetch_one(query=query)
-    return result[0] if result else 0
+# sign-in lookup, also run by benchmarks/signin_benchmark.py
+_APP_USER_QUERY = """
+    SELECT u.first_name, u.last_name, u.email_id, u.password, u.social_login_ids,
+           ARRAY(SELECT r.role FROM app_user_role r WHERE r.user_id = u.user_id ORDER BY r.role) AS roles,
+           ARRAY(SELECT p.permission FROM app_user_permission p WHERE p.user_id = u.user_id ORDER BY p.permission) AS permissions
+    FROM app_user u
+    WHERE u.email_id = :email
+"""
 
 async def get_app_user(email: str) -> AppUser:
-    query = """
-        SELECT first_name, last_name, email_id, password, roles, permissions, social_login_ids
-        FROM app_user 
-        WHERE email_id = :email
-    """
     params = {"email": email}
-    record = await postgre_manager.fetch_one(query=query, values=params)
+    record = await postgre_manager.fetch_one(query=_APP_USER_QUERY, values=params)
 
     if not record:
         raise TravelBotException(
@@ -84,60 +109,92 @@ async def get_app_user(email: str) -> AppUser:
         lastName=record['last_name'],
         email=record['email_id'],
         password=record['password'],  # Return actual password hash
-        roles=record['roles'],
-        permissions=record['permissions'],
+        roles=list(record['roles']),
+        permissions=list(record['permissions']),
         social_login_ids=record['social_login_ids'] if record['social_login_ids'] else None
     )
 
 
-async def assign_roles(email: str, roles: list[str],admin_user:str) -> None:
-    # Check if user exists
-    user_exists = await is_user_exists(email)
-    if not user_exists:
-        raise TravelBotException(
-            message=f"User with email '{email}' not found",
-            error_code=sc.ENTITY_NOT_FOUND
+# join table and value column per grant type; never taken from user input
+_GRANT_TABLES = {
+    "role": ("app_user_role", "role"),
+    "permission": ("app_user_permission", "permission"),
+}
+
+
+def _replace_grants_query(grant_type: str) -> str:
+    """
+    Set-based replacement of the grants of many users in one statement.
+    Input is two parallel arrays of (email, value) pairs; a user whose new
+    list is empty is sent once with a NULL value. Grants not in the new list
+    are deleted and new ones inserted; the two touch disjoint rows because
+    all CTEs of a statement see the same snapshot. Returns the emails found.
+    """
+    table, column = _GRANT_TABLES[grant_type]
+    return f"""
+        WITH input AS (
+            SELECT email_id, value FROM unnest(:emails::text[], :values::text[]) AS i(email_id, value)
+        ),
+        targets AS (
+            UPDATE app_user u
+            SET last_updated_by = :updatedBy, last_updated_on = NOW()
+            FROM (SELECT DISTINCT email_id FROM input) i
+            WHERE u.email_id = i.email_id
+            RETURNING u.user_id, u.email_id
+        ),
+        removed AS (
+            DELETE FROM {table} g
+            USING targets t
+            WHERE g.user_id = t.user_id
+              AND NOT EXISTS (SELECT 1 FROM input i WHERE i.email_id = t.email_id AND i.value = g.{column})
+        ),
+        added AS (
+            INSERT INTO {table} (user_id, {column})
+            SELECT DISTINCT t.user_id, i.value
+            FROM targets t JOIN input i ON i.email_id = t.email_id
+            WHERE i.value IS NOT NULL
+            ON CONFLICT DO NOTHING
         )
+        SELECT email_id FROM targets
+    """
 
-    # Update roles
-    roles_str = ','.join(roles) if roles else ''
-    update_query = """
-        UPDATE app_user 
-        SET roles = :roles, last_updated_by = :updatedBy, last_updated_on = NOW()
-        WHERE email_id = :email
+
+async def replace_grants(grant_type: str, assignments: Dict[str, List[str]], admin_user: str) -> List[str]:
     """
+    Replace the roles or permissions of every user in `assignments`
+    (email -> values) in a single round trip. Returns the emails not found.
+    """
+    emails: List[str] = []
+    values: List[Optional[str]] = []
+    for email, grants in assignments.items():
+        for grant in (grants or [None]):
+            emails.append(email)
+            values.append(grant)
 
-    values = {
-        'roles': roles_str,
-        'updatedBy': admin_user,
-        'email': email
-    }
-    await postgre_manager.execute(query=update_query,values=values)
+    records = await postgre_manager.fetch_all(
+        query=_replace_grants_query(grant_type),
+        values={'emails': emails, 'values': values, 'updatedBy': admin_user}
+    )
+    found = {record['email_id'] for record in records}
+    return [email for email in assignments if email not in found]
 
 
-async def assign_permissions(email: str, permissions: list[str],admin_user:str) -> None:
-    # Check if user exists
-    user_exists = await is_user_exists(email)
-    if not user_exists:
+async def _replace_user_grants(grant_type: str, email: str, grants: list[str], admin_user: str) -> None:
+    # existence check and update in one round trip: an unknown email returns no row
+    not_found = await replace_grants(grant_type, {email: grants}, admin_user)
+    if not_found:
         raise TravelBotException(
             message=f"User with email '{email}' not found",
             error_code=sc.ENTITY_NOT_FOUND
         )
 
-    # Update permissions
-    permissions_str = ','.join(permissions) if permissions else ''
-    update_query = """
-        UPDATE app_user 
-        SET permissions = :permissions, last_updated_by = :updatedBy, last_updated_on = NOW()
-        WHERE email_id = :email
-    """
 
-    values = {
-        'permissions': permissions_str,
-        'updatedBy': admin_user,
-        'email': email
-    }
-    await postgre_manager.execute(query=update_query,values=values)
+async def assign_roles(email: str, roles: list[str],admin_user:str) -> None:
+    await _replace_user_grants("role", email, roles, admin_user)
+
+
+async def assign_permissions(email: str, permissions: list[str],admin_user:str) -> None:
+    await _replace_user_grants("permission", email, permissions, admin_user)
 
 def get_all_roles() -> list[str]:
     roles_str = settings.ALLOWED_ROLES
@@ -167,7 +224,7 @@ async def update_password(email: str, new_password: str) -> None:
         )
 
     # Hash the new password before storing
-    hashed_password = _hash_password(new_password)
+    hashed_password = await _hash_password(new_password)
 
     # Update password
     update_query = """
@@ -184,5 +241,130 @@ async def update_password(email: str, new_password: str) -> None:
     await postgre_manager.execute(query=update_query, values=values)
 
 
-def verify_password(user_password: str, password_in_db: str) -> bool:
-    return bcrypt.checkpw(user_password.encode('utf-8'), password_in_db.encode('utf-8'))
+async def rehash_password(email: str, password: str) -> None:
+    """Store a new hash of a just-verified password, made with the current BCRYPT_ROUNDS"""
+    update_query = """
+        UPDATE app_user
+        SET password = :password, last_updated_on = NOW()
+        WHERE email_id = :email
+    """
+    values = {
+        'password': await _hash_password(password),
+        'email': email
+    }
+    await postgre_manager.execute(query=update_query, values=values)
+
+
+async def verify_password(user_password: str, password_in_db: str) -> bool:
+    return await password_hasher.verify_password(user_password, password_in_db)
+
+
+async def import_users(rows: List[Tuple[int, SignUpRequest, str]], created_by: str) -> Dict[int, bool]:
+    """
+    Insert a batch of (row_no, signup request, password hash) rows with
+    COPY into a temp staging table and one merging INSERT ... ON CONFLICT.
+    Returns row_no -> created; False means the email already existed, in
+    the table or on an earlier row of the batch. Imported users get the
+    'user' role.
+    """
+    async with postgre_manager.transaction() as connection:
+        await connection.execute("""
+            CREATE TEMP TABLE app_user_import (
+                row_no INTEGER NOT NULL,
+                first_name VARCHAR(201) NOT NULL,
+                last_name VARCHAR(201) NOT NULL,
+                email_id VARCHAR(201) NOT NULL,
+                password VARCHAR(1000) NOT NULL
+            ) ON COMMIT DROP
+        """)
+        await connection.copy_records_to_table(
+            "app_user_import",
+            records=[(row_no, request.firstName, request.lastName, request.email, hashed) for row_no, request, hashed in rows],
+            columns=["row_no", "first_name", "last_name", "email_id", "password"],
+        )
+        records = await connection.fetch("""
+            WITH first_rows AS (
+                SELECT DISTINCT ON (email_id) row_no, first_name, last_name, email_id, password
+                FROM app_user_import
+                ORDER BY email_id, row_no
+            ),
+            inserted AS (
+                INSERT INTO app_user (first_name, last_name, email_id, password, created_by, created_on, last_updated_by, last_updated_on)
+                SELECT first_name, last_name, email_id, password, $1, NOW(), $1, NOW()
+                FROM first_rows
+                ON CONFLICT (email_id) DO NOTHING
+                RETURNING user_id, email_id
+            ),
+            roles AS (
+                INSERT INTO app_user_role (user_id, role)
+                SELECT user_id, 'user' FROM inserted
+            )
+            SELECT s.row_no, (ins.email_id IS NOT NULL AND f.row_no IS NOT NULL) AS created
+            FROM app_user_import s
+            LEFT JOIN first_rows f ON f.row_no = s.row_no
+            LEFT JOIN inserted ins ON ins.email_id = s.email_id
+        """, created_by)
+    return {record['row_no']: record['created'] for record in records}
+
+
+# listed columns; password is deliberately not among them
+_USER_DIRECTORY_COLUMNS = """
+    u.user_id, u.first_name, u.last_name, u.email_id, u.created_on,
+    ARRAY(SELECT r.role FROM app_user_role r WHERE r.user_id = u.user_id ORDER BY r.role) AS roles,
+    ARRAY(SELECT p.permission FROM app_user_permission p WHERE p.user_id = u.user_id ORDER BY p.permission) AS permissions
+"""
+
+
+def _user_directory_query(filters: Optional[UserDirectoryFilter], after_user_id: Optional[int], limit: Optional[int]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the directory query from fixed fragments, so each filter
+    combination is a distinct, cacheable prepared statement. The email
+    prefix is a range on text_pattern_ops operators, which the
+    app_user_email_prefix_idx index serves even in a generic plan.
+    """
+    conditions: List[str] = []
+    values: Dict[str, Any] = {}
+    if after_user_id is not None:
+        conditions.append("u.user_id > :afterUserId")
+        values['afterUserId'] = after_user_id
+    if filters and filters.email_prefix:
+        prefix = filters.email_prefix
+        conditions.append("u.email_id ~>=~ :emailPrefix AND u.email_id ~<~ :emailPrefixEnd")
+        values['emailPrefix'] = prefix
+        values['emailPrefixEnd'] = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    if filters and filters.role:
+        conditions.append("EXISTS (SELECT 1 FROM app_user_role fr WHERE fr.user_id = u.user_id AND fr.role = :role)")
+        values['role'] = filters.role
+
+    query = f"SELECT {_USER_DIRECTORY_COLUMNS} FROM app_user u"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY u.user_id"
+    if limit is not None:
+        query += " LIMIT :limit"
+        values['limit'] = limit
+    return query, values
+
+
+def _to_directory_entry(record) -> UserDirectoryEntry:
+    return UserDirectoryEntry(
+        userId=record['user_id'],
+        firstName=record['first_name'],
+        lastName=record['last_name'],
+        email=record['email_id'],
+        roles=list(record['roles']),
+        permissions=list(record['permissions']),
+        createdOn=record['created_on'],
+    )
+
+
+async def list_users(filters: Optional[UserDirectoryFilter], after_user_id: Optional[int], limit: int) -> List[UserDirectoryEntry]:
+    query, values = _user_directory_query(filters, after_user_id, limit)
+    records = await postgre_manager.fetch_all(query=query, values=values)
+    return [_to_directory_entry(record) for record in records]
+
+
+async def iterate_users(filters: Optional[UserDirectoryFilter]) -> AsyncIterator[UserDirectoryEntry]:
+    query, values = _user_directory_query(filters, None, None)
+    async for record in postgre_manager.iterate(query=query, values=values):
+        yield _to_directory_entry(record)
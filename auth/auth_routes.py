@@ -1,13 +1,17 @@
-from fastapi import APIRouter,  Depends
-from utils.commons import to_json_response
-from .auth_models import SignInRequest, SignUpRequest, AuthenticatedUser, AssignRolesRequest,AssignPermissionsRequest
+from fastapi import APIRouter,  Depends, File, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import json
+from utils.commons import to_json_response, PydanticJSONResponse
+from .auth_models import SignInRequest, SignUpRequest, AuthenticatedUser, AssignRolesRequest,AssignPermissionsRequest, BulkAssignRolesRequest, BulkAssignPermissionsRequest, UserDirectoryFilter
 from .auth_service import auth_service
+from . import user_import
 from auth.auth_middleware import auth_middleware
-from utils.logger import logger
+from utils.logger import logger, SAMPLED
 
 
 # Create authentication router
-auth_router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
+auth_router = APIRouter(prefix="/api/v1/auth", tags=["authentication"], default_response_class=PydanticJSONResponse)
 
 @auth_router.post("/signup")
 async def signup(signup_request: SignUpRequest):
@@ -20,7 +24,7 @@ async def signup(signup_request: SignUpRequest):
 async def signin(signin_request: SignInRequest):
     """Authenticate user and return JWT token"""
     result = await auth_service.sign_in(signin_request)
-    logger.info(f"User authentication successful for: {signin_request.email}")
+    logger.info("User authentication successful for: %s", signin_request.email, extra=SAMPLED)
     return to_json_response(result)
 
 @auth_router.post("/signout")
@@ -35,7 +39,7 @@ async def signout(current_user: AuthenticatedUser = Depends(auth_middleware.get_
 async def get_permissions(current_user: AuthenticatedUser = Depends(auth_middleware.get_current_user)):
     """Get current user's permissions and roles"""
     result = await auth_service.get_user_permissions(current_user.token)
-    logger.debug(f"Permissions retrieved for: {current_user.email}")
+    logger.debug("Permissions retrieved for: %s", current_user.email, extra=SAMPLED)
     return to_json_response(result)
 
 @auth_router.post("/assign-roles")
@@ -57,3 +61,60 @@ async def assign_permissions(
     result = await auth_service.assign_permissions(assign_permissions_request.email, assign_permissions_request.permissions,current_user.firstName)
     logger.info(f"Permissions assigned by admin {current_user.firstName} to user: {assign_permissions_request.email}")
     return to_json_response(result)
+
+@auth_router.post("/bulk-assign-roles")
+async def bulk_assign_roles(
+    bulk_request: BulkAssignRolesRequest,
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin())
+):
+    """Replace the roles of many users in one statement (admin only)"""
+    assignments = {assignment.email: assignment.roles for assignment in bulk_request.assignments}
+    result = await auth_service.bulk_assign_roles(assignments, current_user.firstName)
+    return to_json_response(result)
+
+@auth_router.post("/bulk-assign-permissions")
+async def bulk_assign_permissions(
+    bulk_request: BulkAssignPermissionsRequest,
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin())
+):
+    """Replace the permissions of many users in one statement (admin only)"""
+    assignments = {assignment.email: assignment.permissions for assignment in bulk_request.assignments}
+    result = await auth_service.bulk_assign_permissions(assignments, current_user.firstName)
+    return to_json_response(result)
+
+@auth_router.post("/users/import")
+async def import_users(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(default=None, pattern="^(csv|ndjson)$"),
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin())
+):
+    """
+    Bulk import SignUpRequest rows from CSV (firstName,lastName,email,password)
+    or NDJSON (admin only). Streams one NDJSON result per row, then a summary.
+    """
+    import_format = user_import.resolve_format(format, file.filename)
+
+    async def results():
+        async for result in user_import.run_import(user_import.iter_rows(file.read, import_format), current_user.email):
+            yield json.dumps(result).encode("utf-8") + b"\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@auth_router.get("/users")
+async def get_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    filters: UserDirectoryFilter = Depends(),
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin())
+):
+    """List users page by page, filtered by role and email prefix (admin only)"""
+    result = await auth_service.get_users(cursor, limit, filters)
+    return to_json_response(result)
+
+@auth_router.get("/users/stream")
+async def stream_users(
+    filters: UserDirectoryFilter = Depends(),
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin())
+):
+    """Stream all matching users as NDJSON (admin only)"""
+    return StreamingResponse(auth_service.stream_users(filters), media_type="application/x-ndjson")
@@ -1,14 +1,18 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, AsyncIterator
 from travel_bot_exception import TravelBotException
-from utils.logger import logger
+from utils.logger import logger, SAMPLED
 from .auth_models import (
     SignInRequest, SignUpRequest, AuthenticatedUser, AppUser,
+    UserDirectoryFilter, UserDirectoryPage,
     AccessPermissions
 )
 from models.api_responses import SuccessResponse
 from models.status_code import sc
-from .auth_repository import create_user, get_users_count,get_app_user, verify_password, is_user_exists, assign_roles, assign_permissions
+from .auth_repository import create_user, get_app_user, verify_password, rehash_password, assign_roles, assign_permissions, replace_grants, list_users, iterate_users
+from .password_hasher import needs_rehash
 from .jwt_util import JwtUtil
+from .jwt_exception import JwtException
+from .token_denylist import token_denylist
 
 
 class AuthenticationService:
@@ -18,24 +22,16 @@ class AuthenticationService:
         self.jwt_util = JwtUtil()
     
     async def sign_up(self, signup_request: SignUpRequest) -> SuccessResponse[Dict[str, Any]]:
-        # Check if user already exists
-        if await is_user_exists(signup_request.email):
+        # Save user to database; the first signup is made admin by the same statement
+        role = await create_user(signup_request)
+        if role is None:
             logger.warning(f"User registration failed - user already exists: {signup_request.email}")
             raise TravelBotException(
                 message=f"User with email '{signup_request.email}' already exists",
                 error_code=sc.DUPLICATE_ENTITY
             )
 
-        role = "user"
-        #If this is the first signup make the user as admin
-        user_count = await get_users_count()
-        if user_count == 0:
-            role = "admin"
-
-        # Save user to database
-        await create_user(signup_request,role)
-
-        logger.info(f"User registration successful for email: {signup_request.email}")
+        logger.info(f"User registration successful for email: {signup_request.email}, role: {role}")
         return SuccessResponse(
             data={"message": "User registered successfully", "status": "success"},
             status_code=sc.ENTITY_CREATION_SUCCESSFUL
@@ -46,19 +42,23 @@ class AuthenticationService:
         app_user = await get_app_user(signin_request.email)
 
         # Verify user password using the retrieved password hash
-        if not  verify_password(signin_request.password, app_user.password):
+        if not await verify_password(signin_request.password, app_user.password):
             logger.warning(f"User authentication failed - invalid credentials: {signin_request.email}")
             raise TravelBotException(
                 message="Invalid credentials",
                 error_code=sc.UNAUTHORIZED
             )
 
-        # Split comma-separated roles and permissions into arrays
-        roles = app_user.roles.split(',') if app_user.roles else []
-        roles = [role.strip() for role in roles if role.strip()]
-        
-        permissions = app_user.permissions.split(',') if app_user.permissions else []
-        permissions = [permission.strip() for permission in permissions if permission.strip()]
+        # Upgrade hashes made with an older BCRYPT_ROUNDS while the plain password is at hand
+        if needs_rehash(app_user.password):
+            try:
+                await rehash_password(signin_request.email, signin_request.password)
+                logger.info(f"Password rehashed with the current cost factor for: {signin_request.email}")
+            except Exception as e:
+                logger.error(f"Failed to rehash password for {signin_request.email}: {str(e)}")
+
+        roles = app_user.roles
+        permissions = app_user.permissions
 
         # Generate JWT token
         token = self.jwt_util.generate_token(
@@ -80,33 +80,36 @@ class AuthenticationService:
             status_code=sc.SUCCESS)
 
     async def sign_out(self, token: str) -> SuccessResponse[Dict[str, Any]]:
+      claims = self.jwt_util.decode_claims(token)
+      if claims.jti:
+          await token_denylist.revoke(claims.jti, claims.expiration)
+      else:
+          logger.warning(f"Token without jti cannot be revoked, it stays valid until it expires: {claims.username}")
       logger.info("User signout successful")
       return SuccessResponse(
           data={"message": "user logout successful", "status": "success"},
           status_code=sc.SUCCESS)
     
     async def get_user_permissions(self, token: str) -> SuccessResponse[AccessPermissions]:
-        # Validate JWT token
-        if not self.jwt_util.is_token_valid(token):
+        # Validate JWT token and read all user information from a single decode
+        try:
+            claims = self.jwt_util.decode_claims(token)
+        except JwtException:
+            claims = None
+        if claims is None or claims.is_expired() or await token_denylist.is_revoked(claims.jti):
             logger.warning("Invalid JWT token provided for permissions request")
             raise TravelBotException(
                 message="Invalid or expired token",
                 error_code=sc.UNAUTHORIZED,
             )
 
-        # Extract user information from JWT token
-        email = self.jwt_util.extract_username(token)
-        first_name = self.jwt_util.extract_first_name(token)
-        roles = self.jwt_util.extract_roles(token)
-        permissions = self.jwt_util.extract_permissions(token)
-
-        logger.debug(f"Retrieved permissions for user: {email}")
+        logger.debug("Retrieved permissions for user: %s", claims.username, extra=SAMPLED)
         return SuccessResponse(
             data=AccessPermissions(
-                    firstName=first_name,
-                    email=email,
-                    roles=roles,
-                    permissions=permissions
+                    firstName=claims.first_name,
+                    email=claims.username,
+                    roles=claims.roles,
+                    permissions=claims.permissions
                 ),
             status_code=sc.SUCCESS)
 
@@ -129,5 +132,58 @@ class AuthenticationService:
             status_code=sc.SUCCESS
         )
 
+    async def bulk_assign_roles(self, assignments: Dict[str, List[str]], admin_user: str) -> SuccessResponse[Dict[str, Any]]:
+        not_found = await replace_grants("role", assignments, admin_user)
+        logger.info(f"Roles assigned in bulk by {admin_user}: {len(assignments) - len(not_found)} user(s), {len(not_found)} not found")
+        return SuccessResponse(
+            data={"message": "Roles assigned successfully", "status": "success",
+                  "updated": len(assignments) - len(not_found), "not_found": not_found},
+            status_code=sc.SUCCESS
+        )
+
+    async def bulk_assign_permissions(self, assignments: Dict[str, List[str]], admin_user: str) -> SuccessResponse[Dict[str, Any]]:
+        not_found = await replace_grants("permission", assignments, admin_user)
+        logger.info(f"Permissions assigned in bulk by {admin_user}: {len(assignments) - len(not_found)} user(s), {len(not_found)} not found")
+        return SuccessResponse(
+            data={"message": "Permissions assigned successfully", "status": "success",
+                  "updated": len(assignments) - len(not_found), "not_found": not_found},
+            status_code=sc.SUCCESS
+        )
+
+    async def get_users(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        filters: Optional[UserDirectoryFilter] = None,
+    ) -> SuccessResponse[UserDirectoryPage]:
+        """
+        Return one page of the user directory in user_id order. Pages are
+        keyed on user_id: pass the returned next_cursor to fetch the next page.
+        """
+        after_user_id = self._decode_user_cursor(cursor) if cursor else None
+        # one extra row tells whether another page exists
+        users = await list_users(filters, after_user_id, limit + 1)
+        next_cursor = str(users[limit - 1].userId) if len(users) > limit else None
+        return SuccessResponse(
+            data=UserDirectoryPage(users=users[:limit], next_cursor=next_cursor),
+            status_code=sc.SUCCESS
+        )
+
+    async def stream_users(self, filters: Optional[UserDirectoryFilter] = None) -> AsyncIterator[bytes]:
+        """Stream the whole matching directory as newline-delimited JSON through a server-side cursor"""
+        async for user in iterate_users(filters):
+            yield user.model_dump_json().encode("utf-8") + b"\n"
+
+    def _decode_user_cursor(self, cursor: str) -> int:
+        try:
+            return int(cursor)
+        except ValueError as exc:
+            raise TravelBotException(
+                message="Invalid pagination cursor",
+                error_code=sc.VALIDATION_ERROR,
+                original_exception=exc,
+                details={"cursor": cursor}
+            )
+
 #Global instance
 auth_service = AuthenticationService()
\ No newline at end of file
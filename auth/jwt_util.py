@@ -1,5 +1,8 @@
 import jwt
 import base64
+import hashlib
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any, Callable
 from fastapi import Request
@@ -8,6 +11,23 @@ from utils.logger import logger
 from .jwt_exception import JwtException
 
 
+class JwtClaims:
+    """Verified claims of one token, decoded once and read as attributes"""
+
+    def __init__(self, claims: Dict[str, Any]):
+        self.username: str = claims.get('sub')
+        self.jti: Optional[str] = claims.get('jti')
+        self.first_name: str = claims.get(JwtUtil.FIRST_NAME_KEY)
+        self.roles: List[str] = claims.get(JwtUtil.ROLE_KEY, [])
+        self.permissions: List[str] = claims.get(JwtUtil.PERMISSION_KEY, [])
+        self.issued_at = datetime.fromtimestamp(claims.get('iat', 0), tz=timezone.utc)
+        self.expiration = datetime.fromtimestamp(claims.get('exp', 0), tz=timezone.utc)
+        self.raw = claims
+
+    def is_expired(self) -> bool:
+        return self.expiration < datetime.now(timezone.utc)
+
+
 class JwtUtil:
     """JWT utility class for token generation, validation, and claim extraction."""
     
@@ -23,6 +43,10 @@ class JwtUtil:
         """Initialize JWT utility with configuration."""
         self.secret_key = settings.JWT_SECRET_KEY
         self.jwt_expiration = settings.JWT_EXPIRATION
+        self.signing_key = self._get_signing_key()
+        # verified claims by sha256 of the token, least recently used first
+        self._claims_cache: "OrderedDict[bytes, JwtClaims]" = OrderedDict()
+        self._claims_cache_size = settings.JWT_CLAIMS_CACHE_SIZE
         
 
     def extract_raw_token_from_header(self, request: Request, throw_exception_if_not_found: bool = False) -> Optional[str]:
@@ -69,33 +93,59 @@ class JwtUtil:
         
         return self._generate_token(extra_claims, username)
     
+    def decode_claims(self, token: str) -> JwtClaims:
+        """
+        Verify the token once and return its claims. Verified claims are kept
+        in a bounded LRU keyed by the token's hash until the token's exp, so
+        repeated requests with the same token skip the HMAC verification.
+        
+        Raises:
+            JwtException: If token is invalid, malformed or expired
+        """
+        cache_key = hashlib.sha256(token.encode('utf-8')).digest()
+        claims = self._claims_cache.get(cache_key)
+        if claims is not None:
+            if claims.is_expired():
+                del self._claims_cache[cache_key]
+                raise JwtException("JWT token has expired")
+            self._claims_cache.move_to_end(cache_key)
+            return claims
+
+        claims = JwtClaims(self._extract_all_claims(token))
+        self._claims_cache[cache_key] = claims
+        if len(self._claims_cache) > self._claims_cache_size:
+            self._claims_cache.popitem(last=False)
+        return claims
+
+    def clear_claims_cache(self) -> None:
+        self._claims_cache.clear()
+
     def is_token_valid(self, token: str) -> bool:
         try:
-            return not self.is_token_expired(token)
+            return not self.decode_claims(token).is_expired()
         except JwtException:
             return False
     
     def is_token_expired(self, token: str) -> bool:
-      expiration_date = self.extract_expiration(token)
-      return expiration_date < datetime.now(timezone.utc)
+      return self.extract_expiration(token) < datetime.now(timezone.utc)
     
     def get_issued_date(self, token: str) -> datetime:
-        return self._extract_claim(token, lambda claims: datetime.fromtimestamp(claims.get('iat', 0), tz=timezone.utc))
+        return self._extract_claim(token, lambda claims: claims.issued_at)
     
     def extract_username(self, token: str) -> str:
-        return self._extract_claim(token, lambda claims: claims.get('sub'))
+        return self._extract_claim(token, lambda claims: claims.username)
     
     def extract_first_name(self, token: str) -> str:
-        return self._extract_claim(token, lambda claims: claims.get(self.FIRST_NAME_KEY))
+        return self._extract_claim(token, lambda claims: claims.first_name)
     
     def extract_roles(self, token: str) -> List[str]:
-        return self._extract_claim(token, lambda claims: claims.get(self.ROLE_KEY, []))
+        return self._extract_claim(token, lambda claims: claims.roles)
     
     def extract_permissions(self, token: str) -> List[str]:
-        return self._extract_claim(token, lambda claims: claims.get(self.PERMISSION_KEY, []))
+        return self._extract_claim(token, lambda claims: claims.permissions)
     
     def extract_expiration(self, token: str) -> datetime:
-        return self._extract_claim(token, lambda claims: datetime.fromtimestamp(claims.get('exp', 0), tz=timezone.utc))
+        return self._extract_claim(token, lambda claims: claims.expiration)
     
     def _generate_token(self, extra_claims: Dict[str, Any], username: str) -> str:
         """
@@ -115,13 +165,14 @@ class JwtUtil:
             payload = {
                 **extra_claims,
                 'sub': username,
+                'jti': uuid.uuid4().hex,
                 'iat': now,
                 'exp': expiration
             }
             
             token = jwt.encode(
                 payload,
-                self._get_signing_key(),
+                self.signing_key,
                 algorithm=self.JWT_SIGNING_ALGORITHM
             )
             
@@ -131,13 +182,13 @@ class JwtUtil:
             logger.error(f"Error generating JWT token: {str(e)}")
             raise JwtException("Failed to generate JWT token", original_exception=e)
     
-    def _extract_claim(self, token: str, resolver: Callable[[Dict[str, Any]], Any]) -> Any:
+    def _extract_claim(self, token: str, resolver: Callable[[JwtClaims], Any]) -> Any:
         """
         Extract specific claim from token using resolver function.
         
         Args:
             token: JWT token string
-            resolver: Function to extract specific claim from claims dict
+            resolver: Function to extract specific claim from the decoded claims
             
         Returns:
             Extracted claim value
@@ -146,8 +197,7 @@ class JwtUtil:
             JwtException: If token is invalid or malformed
         """
         try:
-            all_claims = self._extract_all_claims(token)
-            return resolver(all_claims)
+            return resolver(self.decode_claims(token))
         except Exception as e:
             logger.error(f"Error extracting claim from token: {str(e)}")
             raise JwtException("Invalid JWT Token", original_exception=e)
@@ -168,7 +218,7 @@ class JwtUtil:
         try:
             payload = jwt.decode(
                 token,
-                self._get_signing_key(),
+                self.signing_key,
                 algorithms=[self.JWT_SIGNING_ALGORITHM]
             )
             return payload
@@ -186,7 +236,7 @@ class JwtUtil:
     
     def _get_signing_key(self) -> str:
         """
-        Get the signing key for JWT operations.
+        Decode the signing key for JWT operations. Called once from __init__.
         
         Returns:
             Signing key string
@@ -0,0 +1,100 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import bcrypt
+
+from models.status_code import sc
+from travel_bot_exception import TravelBotException
+from utils.config import settings
+from utils.logger import logger
+
+_cached_thread_pool: Optional[ThreadPoolExecutor] = None
+_cached_slots: Optional[asyncio.Semaphore] = None
+_cached_import_thread_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _cached_thread_pool
+    if _cached_thread_pool is None:
+        # bcrypt releases the GIL, so threads hash in parallel without blocking the event loop
+        _cached_thread_pool = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+    return _cached_thread_pool
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _cached_slots
+    if _cached_slots is None:
+        _cached_slots = asyncio.Semaphore(settings.BCRYPT_WORKERS)
+    return _cached_slots
+
+
+def _get_import_thread_pool() -> ThreadPoolExecutor:
+    global _cached_import_thread_pool
+    if _cached_import_thread_pool is None:
+        # separate from the sign-in pool so a bulk import never fills its admission queue
+        _cached_import_thread_pool = ThreadPoolExecutor(max_workers=settings.BCRYPT_IMPORT_WORKERS, thread_name_prefix="bcrypt-import")
+    return _cached_import_thread_pool
+
+
+def shutdown_thread_pool() -> None:
+    global _cached_thread_pool, _cached_import_thread_pool
+    if _cached_thread_pool is not None:
+        _cached_thread_pool.shutdown(wait=True, cancel_futures=True)
+        _cached_thread_pool = None
+        logger.info("bcrypt thread pool shut down")
+    if _cached_import_thread_pool is not None:
+        _cached_import_thread_pool.shutdown(wait=True, cancel_futures=True)
+        _cached_import_thread_pool = None
+
+
+async def _run_bcrypt(func, *args):
+    """
+    Run a bcrypt call on the bounded thread pool. At most BCRYPT_WORKERS
+    calls run at once; a call that cannot start within
+    BCRYPT_QUEUE_TIMEOUT_SECONDS is shed with 429 instead of queueing
+    behind a login storm.
+    """
+    slots = _get_slots()
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=settings.BCRYPT_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Password hashing queue deadline exceeded, shedding request")
+        raise TravelBotException(
+            message="Too many concurrent sign-in requests, retry shortly",
+            error_code=sc.TOO_MANY_REQUESTS
+        )
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_thread_pool(), func, *args)
+    finally:
+        slots.release()
+
+
+async def hash_password(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    hashed = await _run_bcrypt(bcrypt.hashpw, password.encode('utf-8'), salt)
+    return hashed.decode('utf-8')
+
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a batch of passwords in parallel on the import thread pool, keeping their order"""
+    loop = asyncio.get_running_loop()
+    pool = _get_import_thread_pool()
+    hashed = await asyncio.gather(*(
+        loop.run_in_executor(pool, bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS))
+        for password in passwords
+    ))
+    return [value.decode('utf-8') for value in hashed]
+
+
+async def verify_password(user_password: str, password_in_db: str) -> bool:
+    return await _run_bcrypt(bcrypt.checkpw, user_password.encode('utf-8'), password_in_db.encode('utf-8'))
+
+
+def needs_rehash(password_in_db: str) -> bool:
+    """True when the stored hash was made with a cost factor other than BCRYPT_ROUNDS"""
+    try:
+        # $2b$<rounds>$<salt+hash>
+        return int(password_in_db.split('$')[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
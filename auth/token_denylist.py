@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from utils.config import settings
+from utils.logger import logger
+from utils.postgre_db_manager import postgre_manager
+
+# rows revoked this close to the last refresh are read again, in case an
+# earlier-stamped insert committed after the refresh query ran
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+# revoked ids together with the database clock, read in the same statement so
+# the watermark and revoked_on come from one clock; the outer join returns the
+# clock row even when no id matches
+_REVOKED_SINCE_QUERY = """
+    WITH clock AS (SELECT NOW() AS synced_until)
+    SELECT clock.synced_until, revoked_token.jti
+    FROM clock LEFT JOIN revoked_token ON revoked_token.revoked_on >= :since
+"""
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.size = max(8, int(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class TokenDenylist:
+    """
+    Revoked token ids (jti) stored in the revoked_token table until the
+    token's own expiry.
+
+    Each process keeps a bloom filter of the revoked ids, refreshed
+    incrementally from revoked_on every TOKEN_DENYLIST_REFRESH_SECONDS and
+    rebuilt from scratch every TOKEN_DENYLIST_REBUILD_SECONDS so expired
+    ids drop out. A token whose jti is not in the filter is accepted without
+    I/O; only a possible match is confirmed against Postgres. A revocation
+    from another worker is seen after at most one refresh interval.
+    """
+
+    def __init__(self):
+        self._bloom: Optional[BloomFilter] = None
+        self._synced_until: Optional[datetime] = None
+        self._rebuilt_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self._rebuild()
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        query = """
+            INSERT INTO revoked_token (jti, expires_at, revoked_on)
+            VALUES (:jti, :expiresAt, NOW())
+            ON CONFLICT (jti) DO NOTHING
+        """
+        await postgre_manager.execute(query=query, values={"jti": jti, "expiresAt": expires_at})
+        if self._bloom is not None:
+            self._bloom.add(jti)
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            # tokens issued before jti was added cannot be revoked
+            return False
+        if self._bloom is not None and not self._bloom.might_contain(jti):
+            return False
+        query = "SELECT 1 FROM revoked_token WHERE jti = :jti AND expires_at > NOW()"
+        return await postgre_manager.fetch_one(query=query, values={"jti": jti}) is not None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TOKEN_DENYLIST_REFRESH_SECONDS)
+            try:
+                if datetime.now(timezone.utc) - self._rebuilt_at >= timedelta(seconds=settings.TOKEN_DENYLIST_REBUILD_SECONDS):
+                    await self._rebuild()
+                else:
+                    await self._refresh()
+            except Exception as e:
+                logger.error(f"Token denylist refresh failed: {str(e)}")
+
+    async def _rebuild(self) -> None:
+        await postgre_manager.execute(query="DELETE FROM revoked_token WHERE expires_at <= NOW()")
+        started = datetime.now(timezone.utc)
+        records = await postgre_manager.fetch_all(
+            query=_REVOKED_SINCE_QUERY,
+            values={"since": datetime.min.replace(tzinfo=timezone.utc)}
+        )
+        jtis = [record['jti'] for record in records if record['jti'] is not None]
+        self.load(jtis)
+        self._synced_until = records[0]['synced_until']
+        self._rebuilt_at = started
+        logger.info(f"Token denylist loaded with {len(jtis)} revoked token(s)")
+
+    def load(self, jtis: Iterable[str]) -> None:
+        """Replace the bloom filter with one holding exactly the given revoked ids"""
+        bloom = BloomFilter(settings.TOKEN_DENYLIST_BLOOM_CAPACITY, settings.TOKEN_DENYLIST_BLOOM_FALSE_POSITIVE_RATE)
+        for jti in jtis:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def _refresh(self) -> None:
+        records = await postgre_manager.fetch_all(
+            query=_REVOKED_SINCE_QUERY,
+            values={"since": self._synced_until - REFRESH_OVERLAP}
+        )
+        for record in records:
+            if record['jti'] is not None:
+                self._bloom.add(record['jti'])
+        # database time, not the app clock, since revoked_on is stamped by NOW()
+        self._synced_until = records[0]['synced_until']
+
+
+#global instance
+token_denylist = TokenDenylist()
@@ -0,0 +1,173 @@
+import codecs
+import csv
+import io
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from models.status_code import sc
+from travel_bot_exception import TravelBotException
+from utils.config import settings
+from utils.logger import logger
+from .auth_models import SignUpRequest
+from .auth_repository import import_users
+from . import password_hasher
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+IMPORT_FORMATS = (CSV_FORMAT, NDJSON_FORMAT)
+
+# bytes read from the upload per await
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def resolve_format(import_format: Optional[str], filename: Optional[str]) -> str:
+    """Use the explicit format, else the file extension (.csv, .ndjson/.jsonl)"""
+    if not import_format and filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        import_format = NDJSON_FORMAT if extension in ("ndjson", "jsonl") else extension
+    if import_format not in IMPORT_FORMATS:
+        raise TravelBotException(
+            message=f"Unsupported import format '{import_format}'",
+            error_code=sc.VALIDATION_ERROR,
+            details={"supported_formats": list(IMPORT_FORMATS)}
+        )
+    return import_format
+
+
+async def iter_rows(read: Callable[[int], Awaitable[bytes]], import_format: str) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (row_no, raw row) from an awaitable read(size), such as
+    UploadFile.read, one READ_CHUNK_SIZE chunk at a time, so a large upload
+    is neither read nor parsed in one go on the event loop. A line that is
+    not valid JSON is yielded as its error message so it is reported, not fatal.
+    """
+    lines = _read_lines(read)
+    if import_format == CSV_FORMAT:
+        async for row in _csv_rows(lines):
+            yield row
+        return
+    row_no = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            yield row_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_no, f"invalid JSON: {e.msg}"
+
+
+async def _read_lines(read: Callable[[int], Awaitable[bytes]]) -> AsyncIterator[str]:
+    """Decode chunks as UTF-8 and yield lines with their line endings, split like newline=''"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    while True:
+        chunk = await read(READ_CHUNK_SIZE)
+        pending += decoder.decode(chunk, final=not chunk)
+        lines = io.StringIO(pending, newline="").readlines()
+        # the last line may go on in the next chunk; a trailing \r may be half of \r\n
+        pending = lines.pop() if chunk and lines and not lines[-1].endswith("\n") else ""
+        for line in lines:
+            yield line
+        if not chunk:
+            return
+
+
+async def _csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Dict[Optional[str], Any]]]:
+    """
+    csv.DictReader over async lines: the header row names the fields and
+    blank lines are skipped. Lines are joined until their quotes balance, so
+    a quoted field may contain line breaks.
+    """
+    fieldnames: Optional[List[str]] = None
+    record, quotes, row_no = "", 0, 0
+
+    def parse(text: str):
+        nonlocal fieldnames, row_no
+        values = next(csv.reader([text]), [])
+        if not values:
+            return None
+        if fieldnames is None:
+            fieldnames = values
+            return None
+        row_no += 1
+        row: Dict[Optional[str], Any] = dict(zip(fieldnames, values))
+        if len(values) > len(fieldnames):
+            row[None] = values[len(fieldnames):]
+        for field in fieldnames[len(values):]:
+            row[field] = None
+        return row_no, row
+
+    async for line in lines:
+        record += line
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        parsed = parse(record)
+        record, quotes = "", 0
+        if parsed is not None:
+            yield parsed
+    if record:
+        parsed = parse(record)
+        if parsed is not None:
+            yield parsed
+
+
+async def run_import(rows: AsyncIterator[Tuple[int, Any]], created_by: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Import signup rows in batches of USER_IMPORT_BATCH_SIZE. Rows are
+    validated as SignUpRequest, passwords of a batch are hashed in parallel
+    on the import bcrypt pool, and the batch is written with one COPY and
+    one merge. Yields a result per row, then a summary with rows per second.
+    """
+    started = time.perf_counter()
+    counts = {"created": 0, "duplicate": 0, "invalid": 0, "failed": 0}
+    batch: List[Tuple[int, SignUpRequest]] = []
+
+    async def flush() -> AsyncIterator[Dict[str, Any]]:
+        async for result in _import_batch(batch, created_by):
+            counts[result["status"]] += 1
+            yield result
+        batch.clear()
+
+    async for row_no, raw in rows:
+        try:
+            if isinstance(raw, str):
+                raise ValueError(raw)
+            batch.append((row_no, SignUpRequest.model_validate(raw)))
+        except (ValidationError, ValueError) as e:
+            counts["invalid"] += 1
+            yield {"row": row_no, "email": raw.get("email") if isinstance(raw, dict) else None,
+                   "status": "invalid", "error": str(e)}
+            continue
+        if len(batch) >= settings.USER_IMPORT_BATCH_SIZE:
+            async for result in flush():
+                yield result
+    if batch:
+        async for result in flush():
+            yield result
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    logger.info(f"User import by {created_by} finished: {counts} in {elapsed:.1f}s")
+    yield {"summary": {**counts, "rows": total, "seconds": round(elapsed, 3),
+                       "rows_per_second": round(total / elapsed, 1) if elapsed else None}}
+
+
+async def _import_batch(batch: List[Tuple[int, SignUpRequest]], created_by: str) -> AsyncIterator[Dict[str, Any]]:
+    try:
+        hashed = await password_hasher.hash_passwords([request.password for _, request in batch])
+        created = await import_users(
+            [(row_no, request, password_hash) for (row_no, request), password_hash in zip(batch, hashed)],
+            created_by,
+        )
+    except Exception as e:
+        logger.error(f"User import batch of {len(batch)} row(s) failed: {str(e)}")
+        for row_no, request in batch:
+            yield {"row": row_no, "email": request.email, "status": "failed", "error": str(e)}
+        return
+    for row_no, request in batch:
+        yield {"row": row_no, "email": request.email, "status": "created" if created.get(row_no) else "duplicate"}
@@ -0,0 +1,53 @@
+"""
+Cost of authenticating a request: auth_middleware.get_current_user with a
+cold claims cache (every call verifies the JWT signature) vs a warm one
+(verified claims served from the LRU).
+
+$ uv run python -m benchmarks.auth_benchmark --calls 100000 --tokens 1000
+
+Needs only the JWT settings from .env; no database is touched.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from auth.auth_middleware import auth_middleware
+from auth.auth_service import auth_service
+from auth.token_denylist import token_denylist
+
+
+async def _run(label: str, calls: int, credentials, clear_cache: bool) -> None:
+    jwt_util = auth_service.jwt_util
+    started = time.perf_counter()
+    for i in range(calls):
+        if clear_cache:
+            jwt_util.clear_claims_cache()
+        await auth_middleware.get_current_user(credentials[i % len(credentials)])
+    elapsed = time.perf_counter() - started
+    print(f"{label:<6} {calls / elapsed:>10,.0f} calls/s  {elapsed / calls * 1e6:>7.1f} us/call")
+
+
+async def main(calls: int, tokens: int) -> None:
+    jwt_util = auth_service.jwt_util
+    # an empty denylist: every token takes the no-I/O bloom filter path
+    token_denylist.load([])
+    credentials = [
+        HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=jwt_util.generate_token(f"user{i}@example.com", f"User{i}", ["user"], ["READ_PLAN"]),
+        )
+        for i in range(tokens)
+    ]
+    await _run("cold", calls, credentials, clear_cache=True)
+    jwt_util.clear_claims_cache()
+    await _run("warm", calls, credentials, clear_cache=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--tokens", type=int, default=1000, help="distinct tokens cycled through")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.tokens))
@@ -0,0 +1,48 @@
+"""
+Cost of turning a SuccessResponse with a 30-day TravelResponse into an HTTP
+response body: model_dump(mode='json') + JSONResponse (json.dumps) vs
+PydanticJSONResponse (model_dump_json straight to bytes).
+
+$ uv run python -m benchmarks.json_response_benchmark --iterations 500
+"""
+import argparse
+import statistics
+import time
+
+from fastapi.responses import JSONResponse
+
+from benchmarks.sample_data import build_travel_response
+from models.api_responses import SuccessResponse
+from utils.commons import PydanticJSONResponse
+
+DAYS = 30
+
+
+def _time(label: str, iterations: int, build) -> None:
+    body = build().body
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - started) * 1000)
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    print(f"{label:<22} {len(body) / 1024:>9.1f}KB  median={statistics.median(timings):>7.2f}ms  p95={p95:>7.2f}ms")
+
+
+def main(iterations: int) -> None:
+    result = SuccessResponse(data=build_travel_response(DAYS))
+    old_body = JSONResponse(content=result.model_dump(exclude_none=True, mode='json')).body
+    new_body = PydanticJSONResponse(content=result).body
+    assert len(old_body) == len(new_body), "both paths must produce the same payload"
+
+    _time("model_dump+json.dumps", iterations,
+          lambda: JSONResponse(content=result.model_dump(exclude_none=True, mode='json'), status_code=result.status_code))
+    _time("model_dump_json", iterations,
+          lambda: PydanticJSONResponse(content=result, status_code=result.status_code))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,107 @@
+"""
+Request throughput with logging off and on.
+
+Runs --requests requests from --concurrency clients against a small FastAPI
+app behind RequestIdMiddleware (in process, through httpx's ASGI transport).
+Each request logs a few INFO lines and a DEBUG payload dump the way the
+travel plan handlers do. Rows:
+  off         level WARNING, nothing is written
+  sync-file   the old setup: RotatingFileHandler called on the event loop
+  queue-text  QueueHandler -> QueueListener thread, text format
+  queue-json  QueueHandler -> QueueListener thread, JSON lines with request ids
+
+$ uv run python -m benchmarks.logging_benchmark --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import logging.handlers
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.sample_data import build_travel_response_data
+from utils.logger import RequestIdMiddleware, configure_logging, logger, stop_logging
+
+PAYLOAD = build_travel_response_data(5)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/plan")
+    async def plan():
+        logger.info("Generating travel plan for email='%s', location='%s'", "user@example.com", PAYLOAD["location"])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("response_content=\n%s", json.dumps(PAYLOAD, indent=4))
+        logger.info("Successfully generated travel plan for email='%s'", "user@example.com")
+        return {"status": "ok"}
+
+    return app
+
+
+def _file_handler(log_dir: Path) -> logging.Handler:
+    return logging.handlers.RotatingFileHandler(log_dir / "bench.log", maxBytes=10 * 1024 * 1024, backupCount=2, encoding="utf-8")
+
+
+def _use_sync_file_handler(log_dir: Path) -> None:
+    stop_logging()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = _file_handler(log_dir)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+async def _run(label: str, app: FastAPI, requests: int, concurrency: int) -> None:
+    remaining = requests
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get("/plan")
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    print(f"{label:<11} {requests / elapsed:>10,.0f} req/s")
+
+
+async def main(requests: int, concurrency: int) -> None:
+    app = build_app()
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_dir = Path(log_dir)
+
+        configure_logging("WARNING", json_output=False, file_handler=_file_handler(log_dir))
+        await _run("off", app, requests, concurrency)
+
+        _use_sync_file_handler(log_dir)
+        await _run("sync-file", app, requests, concurrency)
+
+        configure_logging("INFO", json_output=False, file_handler=_file_handler(log_dir))
+        await _run("queue-text", app, requests, concurrency)
+
+        configure_logging("INFO", json_output=True, file_handler=_file_handler(log_dir))
+        await _run("queue-json", app, requests, concurrency)
+
+        stop_logging()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
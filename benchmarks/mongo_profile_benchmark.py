@@ -0,0 +1,94 @@
+"""
+Throughput of the Mongo client profiles: wire compression, write concern
+of the plan insert and read preference of plan reads.
+
+Needs a replica set for the write-concern and read-preference rows, e.g.
+$ docker run -d --name rs -p 27018:27017 mongo:7.0 --replSet rs0
+$ docker exec rs mongosh --eval 'rs.initiate()'
+$ uv run python -m benchmarks.mongo_profile_benchmark --url "mongodb://localhost:27018/?replicaSet=rs0"
+
+Each row runs --ops operations from --concurrency coroutines and reports ops/s.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import ConfigurationError
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from pymongo.write_concern import WriteConcern
+
+from benchmarks.sample_data import build_travel_response_data
+
+DATABASE = "travel_mate_profile_bench"
+
+WRITE_PROFILES = {
+    "w=1": WriteConcern(w=1),
+    "w=majority": WriteConcern(w="majority"),
+    "w=majority,j": WriteConcern(w="majority", j=True),
+}
+
+READ_PROFILES = {
+    "primary": Primary(),
+    "secondaryPreferred": SecondaryPreferred(),
+}
+
+COMPRESSORS = ["", "zlib", "snappy", "zstd"]
+
+
+async def _run(ops: int, concurrency: int, operation) -> float:
+    remaining = ops
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await operation()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ops / (time.perf_counter() - started)
+
+
+async def bench_client(url: str, compressor: str, ops: int, concurrency: int) -> None:
+    options = {"compressors": compressor} if compressor else {}
+    try:
+        client = AsyncIOMotorClient(url, **options)
+    except ConfigurationError as e:
+        print(f"compressors={compressor or 'none'} skipped: {str(e)}")
+        return
+    try:
+        collection = client[DATABASE]["plans"]
+        await collection.drop()
+        document = {"summary": {"location": "Tenkasi", "number_of_days": 5}, "response": build_travel_response_data(5)}
+        label = f"compressors={compressor or 'none':<7}"
+
+        for name, write_concern in WRITE_PROFILES.items():
+            profiled = collection.with_options(write_concern=write_concern)
+            rate = await _run(ops, concurrency, lambda: profiled.insert_one({**document, "_id": ObjectId()}))
+            print(f"{label} insert {name:<20} {rate:>10,.0f} ops/s")
+
+        ids = [doc["_id"] async for doc in collection.find({}, projection={"_id": 1}).limit(1000)]
+        for name, read_preference in READ_PROFILES.items():
+            profiled = collection.with_options(read_preference=read_preference)
+            rate = await _run(ops, concurrency, lambda: profiled.find_one({"_id": random.choice(ids)}))
+            print(f"{label} read   {name:<20} {rate:>10,.0f} ops/s")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+async def main(url: str, ops: int, concurrency: int) -> None:
+    for compressor in COMPRESSORS:
+        await bench_client(url, compressor, ops, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="mongodb://localhost:27018/?replicaSet=rs0")
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.ops, args.concurrency))
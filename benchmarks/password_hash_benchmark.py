@@ -0,0 +1,83 @@
+"""
+Sign-in password check under a login storm: bcrypt inline on the event loop
+vs on the bounded bcrypt thread pool.
+
+--logins coroutines check a password at the same time while a heartbeat
+coroutine ticks every 10 ms. Each row reports the p50/p99 sign-in latency,
+the number of logins shed with 429 and the worst event-loop stall seen by
+the heartbeat, which is what every other request on the worker waits for.
+
+$ uv run python -m benchmarks.password_hash_benchmark --logins 200
+
+Uses BCRYPT_ROUNDS, BCRYPT_WORKERS and BCRYPT_QUEUE_TIMEOUT_SECONDS from .env.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+import bcrypt
+
+from auth import password_hasher
+from travel_bot_exception import TravelBotException
+from utils.config import settings
+
+HEARTBEAT_SECONDS = 0.01
+PASSWORD = "pass123"
+
+
+async def _inline_verify(password: str, password_in_db: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), password_in_db.encode('utf-8'))
+
+
+async def _run(label: str, logins: int, password_in_db: str, verify: Callable[[str, str], Awaitable[bool]]) -> None:
+    latencies: List[float] = []
+    shed = 0
+    worst_stall_ms = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal worst_stall_ms
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            worst_stall_ms = max(worst_stall_ms, (time.perf_counter() - started - HEARTBEAT_SECONDS) * 1000)
+
+    async def login():
+        nonlocal shed
+        started = time.perf_counter()
+        try:
+            await verify(PASSWORD, password_in_db)
+            latencies.append((time.perf_counter() - started) * 1000)
+        except TravelBotException:
+            shed += 1
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    await asyncio.gather(*(login() for _ in range(logins)))
+    done.set()
+    await beat
+
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100)
+        latency = f"p50={quantiles[49]:>8.1f}ms  p99={quantiles[98]:>8.1f}ms"
+    else:
+        latency = "too few completed logins"
+    print(f"{label:<8} {latency}  shed={shed:<5} worst loop stall={worst_stall_ms:>8.1f}ms")
+
+
+async def main(logins: int) -> None:
+    password_in_db = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode('utf-8')
+    print(f"{logins} concurrent logins, rounds={settings.BCRYPT_ROUNDS}, workers={settings.BCRYPT_WORKERS}, "
+          f"queue timeout={settings.BCRYPT_QUEUE_TIMEOUT_SECONDS}s")
+    await _run("inline", logins, password_in_db, _inline_verify)
+    await _run("pool", logins, password_in_db, password_hasher.verify_password)
+    password_hasher.shutdown_thread_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
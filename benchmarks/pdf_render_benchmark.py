@@ -0,0 +1,48 @@
+"""
+PDF size and render time per language.
+
+$ uv run python -m benchmarks.pdf_render_benchmark
+
+The first render in a process includes TTF parsing/registration; the
+steady-state numbers show the cost once fonts are cached.
+"""
+import statistics
+import time
+
+from models.travel_models import LanguageEnum
+from utils import pdf_manager
+from benchmarks.sample_data import build_travel_request, build_travel_response
+
+ITERATIONS = 20
+DAYS = 7
+
+
+def main():
+    print(f"{'language':<10} {'fonts':<32} {'size (KB)':>10} {'first (ms)':>11} {'median (ms)':>12} {'p95 (ms)':>9}")
+    for language in LanguageEnum:
+        travel_request = build_travel_request(DAYS, language)
+        travel_response = build_travel_response(DAYS, language)
+
+        started = time.perf_counter()
+        pdf_bytes = pdf_manager.generate_travel_plan_pdf(travel_request, travel_response)
+        first_ms = (time.perf_counter() - started) * 1000
+
+        timings = []
+        for _ in range(ITERATIONS):
+            started = time.perf_counter()
+            pdf_manager.generate_travel_plan_pdf(travel_request, travel_response)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        fonts = pdf_manager._get_fonts(language)
+        if language in pdf_manager.LANGUAGE_FONT_FILES and fonts == pdf_manager._DEFAULT_FONTS:
+            print(f"warning: {language.value} fonts missing, measuring Helvetica (run scripts.fetch_fonts)")
+        fonts = ",".join(fonts)
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        print(
+            f"{language.value:<10} {fonts:<32} {len(pdf_bytes) / 1024:>10.1f} "
+            f"{first_ms:>11.1f} {statistics.median(timings):>12.1f} {p95:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Rows per second of the CSV/Parquet plan export pipeline (flatten + encode).
+
+$ uv run python -m benchmarks.plan_export_benchmark --plans 5000
+
+Uses synthetic plans in the stored document shape, so it measures the
+export code itself; Mongo read throughput comes on top of this.
+"""
+import argparse
+import asyncio
+import time
+
+from bson import ObjectId
+
+from benchmarks.sample_data import build_travel_request, build_travel_response_data
+from utils import plan_export_manager
+
+
+async def _row_batches(plans: int, days: int, batch_size: int):
+    request_data = build_travel_request(days).model_dump(exclude_none=True, mode='json')
+    response_data = build_travel_response_data(days)
+    for offset in range(0, plans, batch_size):
+        rows = []
+        for _ in range(min(batch_size, plans - offset)):
+            doc = {"_id": ObjectId(), "email": "user@example.com", "request": request_data}
+            rows.extend(plan_export_manager.flatten_plan(doc, response_data))
+        yield rows
+
+
+async def run(export_format: str, plans: int, days: int, batch_size: int) -> None:
+    rows = plans * days * 6
+    written = 0
+    started = time.perf_counter()
+    async for chunk in plan_export_manager.write_rows(export_format, _row_batches(plans, days, batch_size)):
+        written += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"{export_format:<8} rows={rows} bytes={written / 1024 ** 2:.1f}MB elapsed={elapsed:.2f}s rows/s={rows / elapsed:,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan export throughput")
+    parser.add_argument("--plans", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    for export_format in plan_export_manager.EXPORT_FORMATS:
+        try:
+            asyncio.run(run(export_format, args.plans, args.days, args.batch_size))
+        except ImportError as e:
+            print(f"{export_format:<8} skipped: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost of each stage a 30-day plan goes through between the LLM and the PDF.
+Rows:
+  parse  json.loads + TravelResponse(**data)  vs  model_validate_json on the text
+  store  model_dump(mode='json') of the validated plan, as written to mongo
+  read   TravelRequest(**doc) + TravelResponse(**doc)  vs  from_stored (no validation)
+
+The read row also checks that a plan whose start date has passed still loads
+through from_stored, which the validated path rejects.
+
+$ uv run python -m benchmarks.plan_parse_benchmark --iterations 500
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+from pydantic import ValidationError
+
+from benchmarks.sample_data import build_travel_request, build_travel_response_data
+from models.travel_models import TravelRequest, TravelResponse
+
+DAYS = 30
+
+
+def _time(label: str, iterations: int, func) -> float:
+    func()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(timings)
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    print(f"{label:<34} median={median:>7.3f}ms  p95={p95:>7.3f}ms")
+    return median
+
+
+def main(iterations: int) -> None:
+    llm_text = json.dumps(build_travel_response_data(DAYS), ensure_ascii=False)
+    travel_response = TravelResponse.model_validate_json(llm_text)
+    assert travel_response == TravelResponse(**json.loads(llm_text)), "both parse paths must agree"
+
+    print(f"parse ({len(llm_text) / 1024:.1f}KB of LLM text)")
+    old = _time("  json.loads + TravelResponse(**)", iterations, lambda: TravelResponse(**json.loads(llm_text)))
+    new = _time("  model_validate_json", iterations, lambda: TravelResponse.model_validate_json(llm_text))
+    print(f"  {old / new:.1f}x")
+
+    print("store")
+    _time("  model_dump(mode='json')", iterations, lambda: travel_response.model_dump(exclude_none=True, mode='json'))
+
+    request_doc = build_travel_request(DAYS).model_dump(exclude_none=True, mode='json')
+    response_doc = travel_response.model_dump(exclude_none=True, mode='json')
+    assert TravelResponse.from_stored(response_doc) == travel_response, "from_stored must rebuild the same plan"
+
+    print("read")
+    old = _time("  TravelRequest/Response(**doc)", iterations,
+                lambda: (TravelRequest(**request_doc), TravelResponse(**response_doc)))
+    new = _time("  from_stored", iterations,
+                lambda: (TravelRequest.from_stored(request_doc), TravelResponse.from_stored(response_doc)))
+    print(f"  {old / new:.1f}x")
+
+    past_doc = {**request_doc, "start_date": (date.today() - timedelta(days=7)).isoformat()}
+    try:
+        TravelRequest(**past_doc)
+        print("past trip: validated read accepted it")
+    except ValidationError:
+        print("past trip: validated read rejects it (the old download failure)")
+    TravelRequest.from_stored(past_doc)
+    print("past trip: from_stored loads it")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    main(args.iterations)
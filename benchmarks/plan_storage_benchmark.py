@@ -0,0 +1,135 @@
+"""
+Embedded vs split plan storage: WiredTiger cache hit ratio and list-query latency.
+
+Seeds the same plans twice in a scratch database (<MONGODB_DATABASE>_bench):
+  embedded - summary and full response in one document (the old layout)
+  split    - summary in one collection, zlib-compressed body in plan_body
+then runs the same projected, index-backed listing query against each
+summary collection and reports latency percentiles and the cache hit ratio
+measured from serverStatus over the query phase.
+
+$ uv run python -m benchmarks.plan_storage_benchmark --plans 1000000 --queries 2000
+
+The difference is only visible once the embedded layout no longer fits in
+the WiredTiger cache, e.g. start mongod with --wiredTigerCacheSizeGB 0.25.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
+
+from benchmarks.sample_data import build_travel_response_data
+from utils.config import settings
+from utils.plan_body_codec import encode_plan_body
+
+LOCATIONS = [f"City {i}" for i in range(200)]
+SEED_BATCH = 1000
+PAGE_SIZE = 50
+LIST_PROJECTION = {"summary": 1}
+
+
+def _summary(i: int, base_date: datetime) -> dict:
+    start_date = base_date + timedelta(days=i % 365)
+    return {
+        "email": f"user{i % 50000}@example.com",
+        "location": LOCATIONS[i % len(LOCATIONS)],
+        "number_of_days": 3,
+        "language": "english",
+        "start_date": start_date,
+        "end_date": start_date + timedelta(days=3),
+    }
+
+
+async def seed(database, plans: int, days: int) -> None:
+    response_data = build_travel_response_data(days)
+    body, body_hash = encode_plan_body(response_data)
+    base_date = datetime(2026, 1, 1)
+
+    for name in ("embedded", "split", "split_body"):
+        await database.drop_collection(name)
+
+    for offset in range(0, plans, SEED_BATCH):
+        embedded, split, split_body = [], [], []
+        for i in range(offset, min(offset + SEED_BATCH, plans)):
+            _id = ObjectId()
+            summary = _summary(i, base_date)
+            embedded.append({"_id": _id, "email": summary["email"], "summary": summary, "response": response_data})
+            split.append({"_id": _id, "email": summary["email"], "summary": summary, "body_hash": body_hash})
+            split_body.append({"_id": _id, **body})
+        await database.embedded.insert_many(embedded, ordered=False)
+        await database.split.insert_many(split, ordered=False)
+        await database.split_body.insert_many(split_body, ordered=False)
+        if offset % (SEED_BATCH * 100) == 0:
+            print(f"seeded {offset + len(split)} plans")
+
+    for name in ("embedded", "split"):
+        await database[name].create_index([("summary.location", ASCENDING), ("summary.start_date", ASCENDING)])
+        await database[name].create_index([("summary.start_date", ASCENDING), ("_id", DESCENDING)])
+
+
+async def _cache_counters(client) -> tuple[int, int]:
+    status = await client.admin.command("serverStatus")
+    cache = status["wiredTiger"]["cache"]
+    return cache["pages requested from the cache"], cache["pages read into cache"]
+
+
+async def run_queries(client, collection, queries: int) -> dict:
+    requested_before, read_before = await _cache_counters(client)
+    timings = []
+    for _ in range(queries):
+        location = random.choice(LOCATIONS)
+        from_date = datetime(2026, 1, 1) + timedelta(days=random.randint(0, 300))
+        started = time.perf_counter()
+        await collection.find(
+            {"summary.location": location, "summary.start_date": {"$gte": from_date}},
+            projection=LIST_PROJECTION,
+        ).sort("summary.start_date", ASCENDING).limit(PAGE_SIZE).to_list(length=PAGE_SIZE)
+        timings.append((time.perf_counter() - started) * 1000)
+    requested_after, read_after = await _cache_counters(client)
+
+    requested = requested_after - requested_before
+    read_into_cache = read_after - read_before
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "p99_ms": timings[int(len(timings) * 0.99) - 1],
+        "cache_hit_ratio": 1 - read_into_cache / requested if requested else 1.0,
+    }
+
+
+async def main(plans: int, days: int, queries: int, skip_seed: bool) -> None:
+    client = AsyncIOMotorClient(settings.mongo_db_url)
+    database = client[f"{settings.MONGODB_DATABASE}_bench"]
+    try:
+        if not skip_seed:
+            await seed(database, plans, days)
+
+        for name in ("embedded", "split"):
+            stats = await database.command("collStats", name)
+            # warm up once so both layouts start from the same state
+            await run_queries(client, database[name], min(queries, 200))
+            result = await run_queries(client, database[name], queries)
+            print(
+                f"{name:<9} size={stats['size'] / 1024 ** 2:>9.1f}MB "
+                f"p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms p99={result['p99_ms']:.2f}ms "
+                f"cache_hit_ratio={result['cache_hit_ratio']:.4f}"
+            )
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=3, help="itinerary days per seeded plan")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the previously seeded collections")
+    args = parser.parse_args()
+    asyncio.run(main(args.plans, args.days, args.queries, args.skip_seed))
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from models.travel_models import LanguageEnum, TravelRequest, TravelResponse
+
+# A representative sentence per language, so text width and glyph coverage match real plans
+_SAMPLE_TEXT = {
+    LanguageEnum.ENGLISH: "Walk through the old town and enjoy the view of the temple towers at sunset.",
+    LanguageEnum.TAMIL: "பழைய நகரத்தின் வழியாக நடந்து சூரிய அஸ்தமனத்தில் கோயில் கோபுரங்களின் காட்சியை அனுபவிக்கவும்.",
+    LanguageEnum.HINDI: "पुराने शहर में घूमें और सूर्यास्त के समय मंदिर के शिखरों का नज़ारा देखें।",
+}
+
+
+def build_travel_request(days: int = 30, language: LanguageEnum = LanguageEnum.ENGLISH) -> TravelRequest:
+    return TravelRequest(
+        location="Tenkasi, India",
+        number_of_days=days,
+        start_date=date.today() + timedelta(days=30),
+        preferred_language=language,
+        interests=["history", "food", "nature"],
+    )
+
+
+def build_travel_response_data(days: int = 30, language: LanguageEnum = LanguageEnum.ENGLISH) -> Dict[str, Any]:
+    """Build a plan shaped like a typical LLM response (6 activities a day, 12 places)."""
+    text = _SAMPLE_TEXT[language]
+    start_date = date.today() + timedelta(days=30)
+
+    places = [
+        {
+            "name": f"Place {i}",
+            "description": text,
+            "category": "landmark",
+            "estimated_duration": "2 hours",
+            "approximate_cost": "$10",
+            "location_details": text,
+            "best_time_to_visit": "Morning",
+        }
+        for i in range(12)
+    ]
+    itinerary = [
+        {
+            "day_number": day + 1,
+            "day_date": (start_date + timedelta(days=day)).isoformat(),
+            "title": text[:40],
+            "activities": [
+                {
+                    "time": f"{8 + 2 * slot}:00 AM",
+                    "activity": text[:30],
+                    "description": text,
+                    "location": text[:50],
+                    "duration": "2 hours",
+                    "tips": [text, text, text],
+                }
+                for slot in range(6)
+            ],
+            "meals_suggestions": [text[:40], text[:40], text[:40]],
+            "accommodation_note": text,
+        }
+        for day in range(days)
+    ]
+    return {
+        "location": "Tenkasi, India",
+        "trip_duration": days,
+        "start_date": start_date.isoformat(),
+        "end_date": (start_date + timedelta(days=days)).isoformat(),
+        "language": language.value,
+        "overview": " ".join([text] * 3),
+        "sightseeing_places": places,
+        "itinerary": itinerary,
+        "travel_tips": [text] * 6,
+        "estimated_budget": "$500-700 for medium budget",
+        "weather_info": text,
+    }
+
+
+def build_travel_response(days: int = 30, language: LanguageEnum = LanguageEnum.ENGLISH) -> TravelResponse:
+    return TravelResponse(**build_travel_response_data(days, language))
@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from mongo_collection_names import CollectionNames
+from utils.mongo_db_manager import mongodb_manager
+
+
+async def load_checkpoint(migration_id: str, restart: bool) -> Optional[Any]:
+    """Return the last processed _id of the migration, or None to start from the beginning."""
+    migrations = mongodb_manager.get_collection(CollectionNames.MIGRATIONS)
+    if restart:
+        await migrations.delete_one({"_id": migration_id})
+        return None
+    checkpoint = await migrations.find_one({"_id": migration_id})
+    return checkpoint.get("last_id") if checkpoint else None
+
+
+async def save_checkpoint(migration_id: str, last_id: Any, migrated: int, done: bool = False) -> None:
+    migrations = mongodb_manager.get_collection(CollectionNames.MIGRATIONS)
+    await migrations.update_one(
+        {"_id": migration_id},
+        {
+            "$set": {"last_id": last_id, "done": done, "updated_at": datetime.now(timezone.utc)},
+            "$inc": {"migrated": migrated},
+        },
+        upsert=True,
+    )
@@ -0,0 +1,89 @@
+"""
+Move embedded plan responses from travel_collection into plan_body.
+
+Each embedded `response` is compressed into a plan_body document with the
+same _id, and the summary document gets body_hash/body_size while the
+embedded response is unset. Like the summary backfill, it runs online in
+throttled _id-ordered batches and resumes from its checkpoint. Run
+migrations.travel_summary_migration first: the summary end_date is read
+from the embedded response.
+
+$ uv run python -m migrations.plan_body_migration --batch-size 200 --pause-ms 50
+"""
+import argparse
+import asyncio
+from typing import Any, Dict
+
+from pymongo import ASCENDING, ReplaceOne, UpdateOne
+
+from migrations.migration_checkpoint import load_checkpoint, save_checkpoint
+from mongo_collection_names import CollectionNames
+from utils.logger import logger
+from utils.mongo_db_manager import mongodb_manager
+from utils.plan_body_codec import encode_plan_body
+
+MIGRATION_ID = "plan_body_v1"
+
+
+async def migrate(batch_size: int, pause_ms: int, restart: bool) -> None:
+    await mongodb_manager.connect()
+    try:
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
+        plan_body_collection = mongodb_manager.get_collection(CollectionNames.PLAN_BODY)
+        last_id = await load_checkpoint(MIGRATION_ID, restart)
+        total = 0
+        logger.info(f"Starting {MIGRATION_ID} after _id={last_id}")
+
+        while True:
+            query: Dict[str, Any] = {"response": {"$exists": True}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            docs = await travel_collection.find(query, projection={"response": 1}) \
+                .sort("_id", ASCENDING) \
+                .limit(batch_size) \
+                .to_list(length=batch_size)
+            if not docs:
+                break
+
+            body_writes = []
+            summary_writes = []
+            for doc in docs:
+                body, body_hash = encode_plan_body(doc["response"])
+                # replace keeps a re-run after a partial batch idempotent
+                body_writes.append(ReplaceOne({"_id": doc["_id"]}, body, upsert=True))
+                summary_writes.append(UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"body_hash": body_hash, "body_size": body["raw_size"]}, "$unset": {"response": ""}},
+                ))
+
+            # bodies first, so a summary never loses its response before the body exists
+            await plan_body_collection.bulk_write(body_writes, ordered=False)
+            result = await travel_collection.bulk_write(summary_writes, ordered=False)
+
+            last_id = docs[-1]["_id"]
+            total += result.modified_count
+            await save_checkpoint(MIGRATION_ID, last_id, result.modified_count)
+            print(f"{MIGRATION_ID}: migrated {total} documents, last _id={last_id}")
+
+            if pause_ms:
+                await asyncio.sleep(pause_ms / 1000)
+
+        await save_checkpoint(MIGRATION_ID, last_id, 0, done=True)
+        logger.info(f"Finished {MIGRATION_ID}, migrated {total} documents")
+        print(f"{MIGRATION_ID}: done, migrated {total} documents")
+    finally:
+        await mongodb_manager.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move embedded plan responses into the compressed plan_body collection")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--pause-ms", type=int, default=50, help="pause between batches to limit load on the primary")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint and start from the beginning")
+    args = parser.parse_args()
+    asyncio.run(migrate(args.batch_size, args.pause_ms, args.restart))
+
+
+if __name__ == "__main__":
+    main()
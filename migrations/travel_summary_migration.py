@@ -0,0 +1,109 @@
+"""
+Backfill the `summary` subdocument (native BSON dates) on travel_collection.
+
+Runs online against a live database: documents are processed in _id order
+in small batches with a pause between them, and the last processed _id is
+checkpointed in the migrations collection so an interrupted run resumes
+where it stopped. Documents written by the new code already carry a
+summary and are skipped.
+
+$ uv run python -m migrations.travel_summary_migration --batch-size 500 --pause-ms 50
+"""
+import argparse
+import asyncio
+from typing import Any, Dict
+
+from pymongo import ASCENDING, UpdateOne
+
+from migrations.migration_checkpoint import load_checkpoint, save_checkpoint
+from models.travel_models import PlanSummary
+from mongo_collection_names import CollectionNames
+from utils.logger import logger
+from utils.mongo_db_manager import mongodb_manager
+
+MIGRATION_ID = "travel_summary_v1"
+
+SOURCE_PROJECTION = {
+    "email": 1,
+    "request.location": 1,
+    "request.number_of_days": 1,
+    "request.preferred_language": 1,
+    "request.start_date": 1,
+    "response.end_date": 1,
+}
+
+
+def _build_summary(doc: Dict[str, Any]) -> Dict[str, Any]:
+    request_data = doc.get("request", {})
+    response_data = doc.get("response", {})
+    return PlanSummary(
+        email=doc["email"],
+        location=request_data["location"],
+        number_of_days=request_data["number_of_days"],
+        language=request_data.get("preferred_language"),
+        start_date=request_data["start_date"],
+        end_date=response_data.get("end_date"),
+    ).model_dump(exclude_none=True)
+
+
+async def migrate(batch_size: int, pause_ms: int, restart: bool) -> None:
+    await mongodb_manager.connect()
+    try:
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
+        last_id = await load_checkpoint(MIGRATION_ID, restart)
+        total = 0
+        logger.info(f"Starting {MIGRATION_ID} after _id={last_id}")
+
+        while True:
+            query: Dict[str, Any] = {"summary": {"$exists": False}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            docs = await travel_collection.find(query, projection=SOURCE_PROJECTION) \
+                .sort("_id", ASCENDING) \
+                .limit(batch_size) \
+                .to_list(length=batch_size)
+            if not docs:
+                break
+
+            updates = []
+            for doc in docs:
+                try:
+                    summary = _build_summary(doc)
+                except Exception as e:
+                    logger.warning(f"{MIGRATION_ID}: skipping document {doc['_id']}: {str(e)}")
+                    continue
+                # the summary guard keeps a concurrent live write from being overwritten
+                updates.append(UpdateOne({"_id": doc["_id"], "summary": {"$exists": False}}, {"$set": {"summary": summary}}))
+
+            migrated = 0
+            if updates:
+                result = await travel_collection.bulk_write(updates, ordered=False)
+                migrated = result.modified_count
+
+            last_id = docs[-1]["_id"]
+            total += migrated
+            await save_checkpoint(MIGRATION_ID, last_id, migrated)
+            print(f"{MIGRATION_ID}: migrated {total} documents, last _id={last_id}")
+
+            if pause_ms:
+                await asyncio.sleep(pause_ms / 1000)
+
+        await save_checkpoint(MIGRATION_ID, last_id, 0, done=True)
+        logger.info(f"Finished {MIGRATION_ID}, migrated {total} documents")
+        print(f"{MIGRATION_ID}: done, migrated {total} documents")
+    finally:
+        await mongodb_manager.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill travel_collection.summary with native dates")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause-ms", type=int, default=50, help="pause between batches to limit load on the primary")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint and start from the beginning")
+    args = parser.parse_args()
+    asyncio.run(migrate(args.batch_size, args.pause_ms, args.restart))
+
+
+if __name__ == "__main__":
+    main()
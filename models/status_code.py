@@ -6,13 +6,16 @@ class StatusCode(BaseModel):
   REQUEST_ACCEPTED: int = Field(202)  #for background processing
   ENTITY_DELETION_SUCCESSFUL: int = Field(204)
   NO_CONTENT: int = Field(204)
+  NOT_MODIFIED: int = Field(304)
   ENTITY_NOT_FOUND : int = Field(404)
   VALIDATION_ERROR: int = Field(400)
   DUPLICATE_ENTITY: int = Field(409)
+  CONFLICT: int = Field(409)
   DB_CONNECTION_ERROR: int = Field(503)
   UNPROCESSABLE_ENTITY: int = Field(422)
   UNAUTHORIZED: int = Field(401)
   FORBIDDEN: int = Field(403)
+  TOO_MANY_REQUESTS: int = Field(429)
   INTERNAL_SERVER_ERROR: int = Field(500)
 
 # Global singleton instance
@@ -1,7 +1,20 @@
 from datetime import date,datetime,time
 from enum import Enum
 from pydantic import BaseModel, Field,field_validator
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+
+def parse_stored_date(v) -> date:
+    """
+    Dates come back from mongo and the outbox as the mode='json' dump, which
+    the json_encoders turn into "YYYY-MM-DDT00:00:00", or as datetimes
+    """
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, str):
+        return date.fromisoformat(v[:10])
+    return v
+
 
 class LanguageEnum(str, Enum):
     """Supported languages for the travel assistant"""
@@ -10,6 +23,12 @@ class LanguageEnum(str, Enum):
     HINDI = "hindi"
 
 
+class PlanStatus(str, Enum):
+    """Lifecycle of a stored travel plan document"""
+    PENDING = "pending"  # reserved, LLM generation in progress
+    COMPLETED = "completed"
+
+
 class TravelRequest(BaseModel):
     """Request model for travel itinerary generation"""
     location: str = Field(
@@ -54,6 +73,20 @@ class TravelRequest(BaseModel):
             raise ValueError('Start date cannot be in the past')
         return v
 
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> "TravelRequest":
+        """
+        Build from a stored request without re-validating it. It was validated
+        on the way in, and its start date may since have passed, which
+        validate_start_date would reject.
+        """
+        fields = dict(data)
+        if "start_date" in fields:
+            fields["start_date"] = parse_stored_date(fields["start_date"])
+        if "preferred_language" in fields:
+            fields["preferred_language"] = LanguageEnum(fields["preferred_language"])
+        return cls.model_construct(**fields)
+
     class Config:
         json_encoders = {
             date: lambda v: datetime.combine(v, time.min)
@@ -122,6 +155,13 @@ class DayItinerary(BaseModel):
             return v.date()  # Convert datetime to date
         return v  # Already a date or string
 
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> "DayItinerary":
+        fields = dict(data)
+        fields["day_date"] = parse_stored_date(fields["day_date"])
+        fields["activities"] = [DailyActivity.model_construct(**activity) for activity in fields["activities"]]
+        return cls.model_construct(**fields)
+
     class Config:
         json_encoders = {
             date: lambda v: datetime.combine(v, time.min)
@@ -176,6 +216,20 @@ class TravelResponse(BaseModel):
             return v.date()  # Convert datetime to date
         return v  # Already a date or string
 
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> "TravelResponse":
+        """
+        Build from a stored plan body without re-validating it. Bodies are
+        only written from a validated TravelResponse, so the nested models
+        are constructed directly and only the dates are converted back.
+        """
+        fields = dict(data)
+        fields["start_date"] = parse_stored_date(fields["start_date"])
+        fields["end_date"] = parse_stored_date(fields["end_date"])
+        fields["sightseeing_places"] = [SightseeingPlace.model_construct(**place) for place in fields["sightseeing_places"]]
+        fields["itinerary"] = [DayItinerary.from_stored(day) for day in fields["itinerary"]]
+        return cls.model_construct(**fields)
+
     class Config:
         json_encoders = {
             date: lambda v: datetime.combine(v, time.min)
@@ -200,3 +254,34 @@ class TravelRecord(BaseModel):
             date: lambda v: datetime.combine(v, time.min)
         }  
 
+
+class PlanSummary(BaseModel):
+    """
+    Flat, indexable summary stored alongside each plan in Mongo.
+    Dates are kept as datetimes so they are persisted as native BSON dates.
+    """
+    email: str = Field(..., description="email of person who is going to tour")
+    location: str = Field(..., description="travel destination spot")
+    number_of_days: int = Field(..., description="duration of trip")
+    language: Optional[str] = Field(default=None, description="preferred language of the plan")
+    start_date: datetime = Field(..., description="Trip start date at midnight")
+    end_date: Optional[datetime] = Field(default=None, description="Trip end date at midnight, set once the plan is generated")
+
+    @field_validator('start_date', 'end_date', mode='before')
+    @classmethod
+    def parse_date(cls, v):
+        if isinstance(v, date) and not isinstance(v, datetime):
+            return datetime.combine(v, time.min)  # BSON has no date-only type
+        return v  # Already a datetime or string
+
+
+class TravelRecordFilter(BaseModel):
+    email: Optional[str] = Field(default=None, description="only plans of this user")
+    location: Optional[str] = Field(default=None, description="only plans for this destination (exact match)")
+    from_date: Optional[date] = Field(default=None, description="only plans starting on or after this date")
+    to_date: Optional[date] = Field(default=None, description="only plans starting on or before this date")
+
+
+class TravelRecordPage(BaseModel):
+    records: List[TravelRecord] = Field(..., description="travel records in this page, newest first")
+    next_cursor: Optional[str] = Field(default=None, description="cursor for the next page, absent on the last page")
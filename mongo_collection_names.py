@@ -2,4 +2,12 @@ from typing import Final
 
 
 class CollectionNames:
+    # small, hot per-plan summary documents (request, summary, status, hashes)
     TRAVEL_COLLECTION: Final[str] = "travel_collection"
+    # cold, compressed plan responses keyed by the travel_collection _id
+    PLAN_BODY: Final[str] = "plan_body"
+    MIGRATIONS: Final[str] = "migrations"
+    # materialized admin analytics buckets
+    PLAN_ANALYTICS: Final[str] = "plan_analytics"
+    # watermarks of incremental background jobs
+    JOB_CHECKPOINTS: Final[str] = "job_checkpoints"
@@ -0,0 +1,54 @@
+"""
+Export stored plans, one row per activity, to a CSV or Parquet file.
+
+$ uv run python -m scripts.export_plans --format parquet --output plans.parquet --from-date 2026-01-01
+
+The file is written batch by batch, so memory is bounded by --batch-size
+regardless of how many plans are exported.
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from models.travel_models import TravelRecordFilter
+from travel_bot_service import travelbot_service
+from utils.mongo_db_manager import mongodb_manager
+from utils.plan_export_manager import EXPORT_FORMATS
+
+
+async def export(args: argparse.Namespace) -> None:
+    filters = TravelRecordFilter(
+        email=args.email,
+        location=args.location,
+        from_date=args.from_date,
+        to_date=args.to_date,
+    )
+    await mongodb_manager.connect()
+    try:
+        started = time.perf_counter()
+        written = 0
+        with open(args.output, "wb") as output:
+            async for chunk in travelbot_service.export_plan_rows(args.format, filters, args.batch_size):
+                output.write(chunk)
+                written += len(chunk)
+        elapsed = time.perf_counter() - started
+        print(f"wrote {written / 1024 ** 2:.1f}MB to {args.output} in {elapsed:.1f}s")
+    finally:
+        await mongodb_manager.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export travel plans to CSV or Parquet")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--email")
+    parser.add_argument("--location")
+    parser.add_argument("--from-date", type=date.fromisoformat)
+    parser.add_argument("--to-date", type=date.fromisoformat)
+    asyncio.run(export(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
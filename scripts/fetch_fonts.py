@@ -0,0 +1,42 @@
+"""
+Download the Noto Sans Tamil and Devanagari fonts used for Tamil and Hindi
+pdfs into PDF_FONT_DIR. The fonts are licensed under the SIL Open Font
+License 1.1 (https://openfontlicense.org). Files that already exist are kept.
+
+$ uv run python -m scripts.fetch_fonts
+"""
+import argparse
+import os
+
+import httpx
+
+from utils.config import settings
+from utils.pdf_manager import LANGUAGE_FONT_FILES
+
+# static hinted TTFs published by the Noto project; <family>/hinted/ttf/<file>
+DEFAULT_BASE_URL = "https://raw.githubusercontent.com/notofonts/notofonts.github.io/main/fonts"
+
+
+def main(font_dir: str, base_url: str) -> None:
+    os.makedirs(font_dir, exist_ok=True)
+    with httpx.Client(follow_redirects=True, timeout=60) as client:
+        for font_files in LANGUAGE_FONT_FILES.values():
+            for font_file in font_files:
+                target = os.path.join(font_dir, font_file)
+                if os.path.exists(target):
+                    print(f"{target} already exists")
+                    continue
+                family = font_file.split("-")[0]
+                response = client.get(f"{base_url}/{family}/hinted/ttf/{font_file}")
+                response.raise_for_status()
+                with open(target, "wb") as f:
+                    f.write(response.content)
+                print(f"downloaded {target} ({len(response.content) / 1024:.0f}KB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--font-dir", default=settings.PDF_FONT_DIR)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="mirror laid out as <family>/hinted/ttf/<file>")
+    args = parser.parse_args()
+    main(args.font_dir, args.base_url)
@@ -0,0 +1,50 @@
+"""
+Bulk import users from a CSV (firstName,lastName,email,password) or NDJSON
+file of signup rows, the same way as POST /api/v1/auth/users/import.
+
+$ uv run python -m scripts.import_users --input agency_users.csv --results results.ndjson
+
+Per-row results go to --results (stdout by default); the summary with
+rows per second is printed at the end.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from auth import password_hasher, user_import
+from utils.postgre_db_manager import postgre_manager
+
+
+async def run(args: argparse.Namespace) -> None:
+    import_format = user_import.resolve_format(args.format, args.input)
+    await postgre_manager.connect()
+    output = open(args.results, "w", encoding="utf-8") if args.results else sys.stdout
+    try:
+        with open(args.input, "rb") as source:
+            async def read(size: int) -> bytes:
+                return await asyncio.to_thread(source.read, size)
+
+            async for result in user_import.run_import(user_import.iter_rows(read, import_format), args.created_by):
+                if "summary" in result:
+                    print(f"summary: {json.dumps(result['summary'])}")
+                else:
+                    output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        await postgre_manager.disconnect()
+        password_hasher.shutdown_thread_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or NDJSON")
+    parser.add_argument("--input", required=True)
+    parser.add_argument("--format", choices=user_import.IMPORT_FORMATS)
+    parser.add_argument("--results")
+    parser.add_argument("--created-by", default="import")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
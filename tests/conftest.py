@@ -0,0 +1,28 @@
+import os
+import sys
+from pathlib import Path
+
+# Settings are required at import time; tests never reach the real services
+_TEST_ENV = {
+    "APP_PORT": "8002",
+    "DEV_MODE": "true",
+    "JWT_SECRET_KEY": "test-secret",
+    "ALLOWED_ROLES": "user,admin",
+    "ALLOWED_PERMISSIONS": "read,write",
+    "MONGO_PORT": "27017",
+    "MONGO_USER": "test",
+    "MONGO_PASSWORD": "test",
+    "MONGODB_DATABASE": "ai_travel_bot_test",
+    "POSTGRE_PORT": "5432",
+    "POSTGRE_USER": "test",
+    "POSTGRE_PASSWORD": "test",
+    "POSTGRE_DATABASE": "ai_travel_bot_test",
+    "OPENAI_API_KEY": "test",
+    "OPENAI_DEFAULT_MODEL": "gpt-4o-mini",
+    "OPENAI_MAX_TOKENS": "4000",
+    "OPENAI_TEMPERATURE": "0.3",
+}
+for name, value in _TEST_ENV.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
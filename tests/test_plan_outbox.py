@@ -0,0 +1,107 @@
+import asyncio
+import json
+from datetime import datetime, time
+
+import pytest
+from bson import ObjectId
+
+import travel_bot_service
+from benchmarks.sample_data import build_travel_request, build_travel_response
+from models.travel_models import PlanStatus
+from utils.config import settings
+from utils.plan_outbox import PlanOutbox
+
+
+class FakeCollection:
+    def __init__(self):
+        self.inserted = []
+        self.bulk_writes = []
+
+    async def insert_many(self, documents, ordered=True):
+        self.inserted.extend(documents)
+
+    async def bulk_write(self, requests, ordered=True):
+        self.bulk_writes.extend(requests)
+
+
+class FakeMongoManager:
+    def __init__(self):
+        self.collections = {}
+
+    def get_collection(self, name, profile=None):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+def _outbox_entry():
+    travel_request = build_travel_request(3)
+    travel_response = build_travel_response(3)
+    # the same shape TravelBotService._enqueue_travel_plan appends to the outbox
+    return travel_request, travel_response, {
+        "id": str(ObjectId()),
+        "email": "user@example.com",
+        "request": travel_request.model_dump(exclude_none=True, mode='json'),
+        "response": travel_response.model_dump(exclude_none=True, mode='json'),
+    }
+
+
+@pytest.mark.asyncio
+async def test_write_outbox_plans_stores_summary_from_model_dump(monkeypatch):
+    fake_mongo = FakeMongoManager()
+    monkeypatch.setattr(travel_bot_service, "mongodb_manager", fake_mongo)
+    travel_request, travel_response, entry = _outbox_entry()
+
+    await travel_bot_service.travelbot_service.write_outbox_plans([entry])
+
+    bodies = fake_mongo.collections[travel_bot_service.CollectionNames.PLAN_BODY].inserted
+    assert [body["_id"] for body in bodies] == [ObjectId(entry["id"])]
+
+    [update] = fake_mongo.collections[travel_bot_service.CollectionNames.TRAVEL_COLLECTION].bulk_writes
+    stored = update._doc["$set"]
+    assert stored["status"] == PlanStatus.COMPLETED.value
+    assert stored["summary"]["start_date"] == datetime.combine(travel_request.start_date, time.min)
+    assert stored["summary"]["end_date"] == datetime.combine(travel_response.end_date, time.min)
+
+
+@pytest.mark.asyncio
+async def test_lookup_finds_queued_plan_until_written(tmp_path):
+    release = asyncio.Event()
+
+    async def writer(entries):
+        await release.wait()
+
+    outbox = PlanOutbox(str(tmp_path / "plan_outbox.log"))
+    await outbox.start(writer)
+    travel_request, _, entry = _outbox_entry()
+    await outbox.put(entry)
+
+    assert outbox.lookup(entry["email"], travel_request.start_date) is entry
+    assert outbox.lookup("other@example.com", travel_request.start_date) is None
+
+    release.set()
+    await outbox.stop()
+    assert outbox.lookup(entry["email"], travel_request.start_date) is None
+
+
+@pytest.mark.asyncio
+async def test_failing_plan_is_dead_lettered_without_blocking_the_rest(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PLAN_OUTBOX_RETRY_DELAY_SECONDS", 0)
+    written = []
+
+    async def writer(entries):
+        if any(entry["email"] == "bad@example.com" for entry in entries):
+            raise KeyError("location")
+        written.extend(entries)
+
+    entries = [_outbox_entry()[2] for _ in range(3)]
+    entries[1]["email"] = "bad@example.com"
+
+    outbox = PlanOutbox(str(tmp_path / "plan_outbox.log"))
+    await outbox.start(writer)
+    for entry in entries:
+        await outbox.put(entry)
+    await outbox.stop()
+
+    assert [entry["id"] for entry in written] == [entries[0]["id"], entries[2]["id"]]
+    [dead] = [json.loads(line) for line in outbox.dead_letter_path.read_text().splitlines()]
+    assert dead["entry"]["id"] == entries[1]["id"]
+    assert "KeyError" in dead["error"]
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, Response, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Path, Query, Response, File, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from datetime import date
-from models.travel_models import TravelRequest
+from models.travel_models import TravelRequest, TravelRecordFilter
 from travel_bot_service import travelbot_service
 from auth.auth_models import AuthenticatedUser
 from auth.auth_middleware import auth_middleware
-from utils.commons import to_json_response
+from utils.commons import to_json_response, PydanticJSONResponse
+from utils.config import settings
+from models.status_code import sc
 
-travelbot_router = APIRouter(prefix="/api/v1/travelbot", tags=["travelbot"])
+travelbot_router = APIRouter(prefix="/api/v1/travelbot", tags=["travelbot"], default_response_class=PydanticJSONResponse)
 
 @travelbot_router.post("/plan")
 async def generate_travel_plan(
@@ -30,7 +33,91 @@ async def download_travel_plan(
     }
     return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
 
+@travelbot_router.get("/plan/json")
+async def get_travel_plan(
+    start_date: date,
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: AuthenticatedUser = Depends(auth_middleware.get_current_user),
+):
+  etag, result = await travelbot_service.get_travel_plan(current_user.email, start_date, if_none_match)
+  # plans are write-once, so a cached copy stays valid; private because it is per user
+  headers = {
+      "ETag": etag,
+      "Cache-Control": f"private, max-age={settings.PLAN_CACHE_MAX_AGE_SECONDS}",
+  }
+  if result is None:
+    return Response(status_code=sc.NOT_MODIFIED, headers=headers)
+  response = to_json_response(result)
+  response.headers.update(headers)
+  return response
+
+@travelbot_router.get("/plan/mine")
+async def get_my_travel_plans(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: AuthenticatedUser = Depends(auth_middleware.get_current_user),
+):
+  result = await travelbot_service.get_all_travel_plans(cursor, limit, TravelRecordFilter(email=current_user.email))
+  return to_json_response(result)
+
+@travelbot_router.get("/plan/{start_date}/day/{day_number}")
+async def get_travel_plan_day(
+    start_date: date,
+    day_number: int = Path(..., ge=1, le=30),
+    current_user: AuthenticatedUser = Depends(auth_middleware.get_current_user),
+):
+  result = await travelbot_service.get_travel_plan_day(current_user.email, start_date, day_number)
+  return to_json_response(result)
+
 @travelbot_router.get("/plan/all")
-async def get_all_travel_plans(current_user: AuthenticatedUser = Depends(auth_middleware.require_admin())):
-  result = await travelbot_service.get_all_travel_plans()
-  return to_json_response(result)
\ No newline at end of file
+async def get_all_travel_plans(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    filters: TravelRecordFilter = Depends(),
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin()),
+):
+  result = await travelbot_service.get_all_travel_plans(cursor, limit, filters)
+  return to_json_response(result)
+
+@travelbot_router.get("/plan/all/stream")
+async def stream_all_travel_plans(
+    filters: TravelRecordFilter = Depends(),
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin()),
+):
+  return StreamingResponse(
+      travelbot_service.stream_all_travel_plans(filters),
+      media_type="application/x-ndjson",
+  )
+
+@travelbot_router.get("/plan/export")
+async def export_travel_plans(
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin()),
+):
+  filename = f"travel-plans-{from_date or 'all'}-{to_date or 'all'}.zip"
+  headers = {
+      "Content-Disposition": f'attachment; filename="{filename}"'
+  }
+  return StreamingResponse(
+      travelbot_service.export_travel_plans(from_date, to_date),
+      media_type="application/zip",
+      headers=headers,
+  )
+
+@travelbot_router.get("/plan/export/rows")
+async def export_travel_plan_rows(
+    format: str = Query(default="csv", pattern="^(csv|parquet)$"),
+    filters: TravelRecordFilter = Depends(),
+    current_user: AuthenticatedUser = Depends(auth_middleware.require_admin()),
+):
+  travelbot_service.validate_export_format(format)
+  media_type = "text/csv" if format == "csv" else "application/vnd.apache.parquet"
+  headers = {
+      "Content-Disposition": f'attachment; filename="travel-plans.{format}"'
+  }
+  return StreamingResponse(
+      travelbot_service.export_plan_rows(format, filters),
+      media_type=media_type,
+      headers=headers,
+  )
@@ -2,21 +2,53 @@ from datetime import datetime, timezone, date, time
 from models.api_responses import SuccessResponse
 from models.status_code import sc
 from models.travel_models import *
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple
 from utils.logger import logger
-from utils.mongo_db_manager import mongodb_manager
+from utils.mongo_db_manager import mongodb_manager, MongoProfile
 from mongo_collection_names import CollectionNames
 from utils.config import settings
 from travel_bot_exception import TravelBotException
 from bson import ObjectId
 from bson.errors import InvalidId
-import csv
-import io
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import asyncio
+import importlib.util
+import zipfile
 from utils import llm_manager, pdf_manager
+from utils.plan_body_codec import encode_plan_body, decode_plan_body, decode_plan_days, content_hash
+from utils.stream_buffer import StreamBuffer
+from utils.plan_outbox import plan_outbox
+from utils import plan_export_manager
+from migrations.travel_summary_migration import MIGRATION_ID as SUMMARY_MIGRATION_ID
 
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# Fields needed to build a TravelRecord; keeps itineraries off the wire
+TRAVEL_RECORD_PROJECTION = {
+    "_id": 1,
+    "summary.email": 1,
+    "summary.location": 1,
+    "summary.number_of_days": 1,
+    "summary.start_date": 1,
+    "summary.end_date": 1,
+    # plans the summary backfill has not reached yet
+    "email": 1,
+    "request.location": 1,
+    "request.number_of_days": 1,
+    "request.start_date": 1,
+    "response.end_date": 1,
+}
+
+# how often to re-check whether the summary backfill has finished
+SUMMARY_MIGRATION_CHECK_SECONDS = 60
 
 class TravelBotService:
 
+    def __init__(self):
+        self._summary_backfilled = False
+        self._summary_checked_at: Optional[float] = None
+
     async def generate_travel_plan(self,email: str,travel_request: TravelRequest) -> SuccessResponse[TravelResponse]:
       try:
           logger.info(
@@ -25,24 +57,26 @@ class TravelBotService:
               f"days={travel_request.number_of_days}"
           )
 
-          # Check if plan already exists
-          if await self._is_plan_exists(email, travel_request.start_date):
-              raise TravelBotException(
-                  message="Travel plan already exists for this email and start date",
-                  error_code=sc.DUPLICATE_ENTITY,
-                  details={"email": email, "start_date": travel_request.start_date.isoformat()}
-              )
+          # Reserve email + start_date before paying for the LLM call
+          reservation_id = await self._reserve_travel_plan(email, travel_request)
 
-          # Call LLM manager to generate the travel plan
-          travel_response: TravelResponse = await llm_manager.generate_travel_plan(travel_request)
+          try:
+              # Call LLM manager to generate the travel plan
+              travel_response: TravelResponse = await llm_manager.generate_travel_plan(travel_request)
 
-          logger.info(
-              f"Successfully generated travel plan for email='{email}', "
-              f"location='{travel_request.location}'"
-          )
+              logger.info(
+                  f"Successfully generated travel plan for email='{email}', "
+                  f"location='{travel_request.location}'"
+              )
 
-          # Persist request/response for later retrieval/analytics
-          await self._persist_travel_data(email, travel_request, travel_response)
+              # Persist response for later retrieval/analytics
+              if plan_outbox.enabled:
+                  await self._enqueue_travel_plan(reservation_id, email, travel_request, travel_response)
+              else:
+                  await self._complete_travel_plan(reservation_id, email, travel_request, travel_response)
+          except BaseException:
+              await self._release_travel_plan(reservation_id)
+              raise
 
           return SuccessResponse(data=travel_response, status_code=sc.SUCCESS)
 
@@ -56,28 +90,185 @@ class TravelBotService:
               original_exception=exc,
           )
 
-    async def _is_plan_exists(self, email:str, start_date:date) -> bool:
+    async def _reserve_travel_plan(self, email: str, travel_request: TravelRequest) -> ObjectId:
+        """
+        Insert a pending plan document. The unique email_request_start_date_idx
+        makes the insert double as the duplicate check, so concurrent requests
+        for the same email and start_date cannot both reach the LLM.
+        Reservations that are never completed expire via the TTL index on reserved_at.
+        """
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_WRITES)
+        try:
+            result = await travel_collection.insert_one({
+                "email": email,
+                "request": travel_request.model_dump(exclude_none=True, mode='json'),
+                "summary": PlanSummary(
+                    email=email,
+                    location=travel_request.location,
+                    number_of_days=travel_request.number_of_days,
+                    language=travel_request.preferred_language.value,
+                    start_date=travel_request.start_date,
+                ).model_dump(exclude_none=True),
+                "status": PlanStatus.PENDING.value,
+                "reserved_at": datetime.now(timezone.utc),
+            })
+        except DuplicateKeyError as exc:
+            raise TravelBotException(
+                message="Travel plan already exists for this email and start date",
+                error_code=sc.DUPLICATE_ENTITY,
+                original_exception=exc,
+                details={"email": email, "start_date": travel_request.start_date.isoformat()}
+            )
+        return result.inserted_id
+
+    async def _complete_travel_plan(
+        self, reservation_id: ObjectId, email: str, travel_request: TravelRequest, travel_response: TravelResponse
+    ) -> None:
         """
-        Check if a travel plan already exists for the given email and start_date.
-        Returns True if a plan exists, False otherwise.
+        Store the compressed response in plan_body and mark the summary
+        document completed. The body is written first so a completed
+        summary always has a body to load. If the TTL index already removed
+        the reservation, the full summary document is inserted again.
         """
-        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
-        start_datetime = datetime.combine(start_date, time.min)  # datetime object
-        start_datetime_iso = start_datetime.isoformat()  # "2025-12-25T00:00:00" (matches stored format)
-        doc = await travel_collection.find_one({
+        body, body_hash = encode_plan_body(travel_response.model_dump(exclude_none=True, mode='json'))
+        plan_body_collection = mongodb_manager.get_collection(CollectionNames.PLAN_BODY, MongoProfile.PLAN_WRITES)
+        await plan_body_collection.insert_one({"_id": reservation_id, **body})
+
+        completed = {
+            "summary.end_date": datetime.combine(travel_response.end_date, time.min),
+            "status": PlanStatus.COMPLETED.value,
+            "body_hash": body_hash,
+            "body_size": body["raw_size"],
+        }
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_WRITES)
+        result = await travel_collection.update_one(
+            {"_id": reservation_id},
+            {"$set": completed, "$unset": {"reserved_at": ""}}
+        )
+        if result.matched_count:
+            return
+
+        logger.warning(f"Travel plan reservation {reservation_id} expired before completion, storing the plan again")
+        try:
+            await travel_collection.insert_one({
+                "_id": reservation_id,
+                "email": email,
+                "request": travel_request.model_dump(exclude_none=True, mode='json'),
+                "summary": PlanSummary(
+                    email=email,
+                    location=travel_request.location,
+                    number_of_days=travel_request.number_of_days,
+                    language=travel_request.preferred_language.value,
+                    start_date=travel_request.start_date,
+                    end_date=travel_response.end_date,
+                ).model_dump(exclude_none=True),
+                "status": PlanStatus.COMPLETED.value,
+                "body_hash": body_hash,
+                "body_size": body["raw_size"],
+                # the analytics watermark may already have passed this reservation's _id
+                "analytics_late": True,
+            })
+        except DuplicateKeyError as exc:
+            # a newer request took the same email + start date after the reservation expired
+            await plan_body_collection.delete_one({"_id": reservation_id})
+            raise TravelBotException(
+                message="Travel plan already exists for this email and start date",
+                error_code=sc.DUPLICATE_ENTITY,
+                original_exception=exc,
+                details={"email": email, "start_date": travel_request.start_date.isoformat()}
+            )
+
+    async def _enqueue_travel_plan(
+        self, reservation_id: ObjectId, email: str, travel_request: TravelRequest, travel_response: TravelResponse
+    ) -> None:
+        """
+        Write-behind variant of _complete_travel_plan: the plan is appended to
+        the durable outbox and written to Mongo by its flusher, so the
+        response does not wait on Mongo.
+        """
+        await plan_outbox.put({
+            "id": str(reservation_id),
             "email": email,
-            "request.start_date": start_datetime_iso
+            "request": travel_request.model_dump(exclude_none=True, mode='json'),
+            "response": travel_response.model_dump(exclude_none=True, mode='json'),
         })
-        return doc is not None
 
-    async def _persist_travel_data(self, email:str,travel_request: TravelRequest, travel_response: TravelResponse) -> None:
-        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
-        await travel_collection.insert_one({
-            "email": email,
-            "request" : travel_request.model_dump(exclude_none=True,mode='json'),
-            "response" : travel_response.model_dump(exclude_none=True,mode='json')
-          })
-    
+    async def write_outbox_plans(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Outbox writer: store a batch of plans with one insert_many into
+        plan_body and one bulk_write of the summaries. Both are idempotent so
+        a replayed batch is harmless, and the summaries are upserted in full
+        in case the pending reservation expired while Mongo was unreachable.
+        """
+        bodies = []
+        summaries = []
+        for entry in entries:
+            plan_id = ObjectId(entry["id"])
+            request_data = entry["request"]
+            response_data = entry["response"]
+            body, body_hash = encode_plan_body(response_data)
+            bodies.append({"_id": plan_id, **body})
+            summaries.append(UpdateOne(
+                {"_id": plan_id},
+                {
+                    "$set": {
+                        "email": entry["email"],
+                        "request": request_data,
+                        "summary": PlanSummary(
+                            email=entry["email"],
+                            location=request_data["location"],
+                            number_of_days=request_data["number_of_days"],
+                            language=request_data.get("preferred_language"),
+                            start_date=parse_stored_date(request_data["start_date"]),
+                            end_date=parse_stored_date(response_data["end_date"]),
+                        ).model_dump(exclude_none=True),
+                        "status": PlanStatus.COMPLETED.value,
+                        "body_hash": body_hash,
+                        "body_size": body["raw_size"],
+                    },
+                    "$unset": {"reserved_at": ""},
+                    # inserted only when the reservation expired; the analytics watermark may have passed its _id
+                    "$setOnInsert": {"analytics_late": True},
+                },
+                upsert=True,
+            ))
+
+        plan_body_collection = mongodb_manager.get_collection(CollectionNames.PLAN_BODY, MongoProfile.PLAN_WRITES)
+        try:
+            await plan_body_collection.insert_many(bodies, ordered=False)
+        except BulkWriteError as exc:
+            # bodies already stored by an earlier attempt of this batch
+            self._raise_unless_duplicates(exc)
+
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_WRITES)
+        try:
+            await travel_collection.bulk_write(summaries, ordered=False)
+        except BulkWriteError as exc:
+            # the reservation expired and the same email + start_date was taken by a newer request
+            self._raise_unless_duplicates(exc)
+            dropped_ids = []
+            for error in exc.details["writeErrors"]:
+                logger.error(f"Dropping outbox plan {entries[error['index']]['id']}: {error['errmsg']}")
+                dropped_ids.append(ObjectId(entries[error["index"]]["id"]))
+            # their bodies were stored above and would otherwise be orphaned
+            await plan_body_collection.delete_many({"_id": {"$in": dropped_ids}})
+
+    def _raise_unless_duplicates(self, exc: BulkWriteError) -> None:
+        if any(error["code"] != DUPLICATE_KEY_ERROR_CODE for error in exc.details.get("writeErrors", [])) \
+                or exc.details.get("writeConcernErrors"):
+            raise exc
+
+    async def _release_travel_plan(self, reservation_id: ObjectId) -> None:
+        try:
+            travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
+            result = await travel_collection.delete_one({"_id": reservation_id, "status": PlanStatus.PENDING.value})
+            if result.deleted_count:
+                plan_body_collection = mongodb_manager.get_collection(CollectionNames.PLAN_BODY)
+                await plan_body_collection.delete_one({"_id": reservation_id})
+        except Exception as exc:
+            # the TTL index removes the reservation eventually
+            logger.error(f"Failed to release travel plan reservation {reservation_id}: {str(exc)}")
+
     async def download_travel_plan(self, email: str,start_date:date) -> bytes:
         """
         Fetch the stored travel request/response for the given email and
@@ -86,14 +277,19 @@ class TravelBotService:
         try:
             logger.info(f"Downloading travel plan PDF for email='{email}' and start_date={start_date}")
 
-            travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
-            start_datetime = datetime.combine(start_date, time.min)  # datetime object
-            start_datetime_iso = start_datetime.isoformat()  # "2025-12-25T00:00:00" (matches stored format)
+            # read-your-writes for plans still waiting in the write-behind outbox
+            outbox_entry = plan_outbox.lookup(email, start_date)
+            if outbox_entry:
+                travel_request = TravelRequest.from_stored(outbox_entry["request"])
+                travel_response = TravelResponse.from_stored(outbox_entry["response"])
+                return await pdf_manager.render_travel_plan_pdf(travel_request, travel_response)
 
+            travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_OWNER_READS)
             doc = await travel_collection.find_one(
               {
                 "email": email,
-                "request.start_date": start_datetime_iso
+                **(await self._start_date_match(start_date)),
+                "status": {"$ne": PlanStatus.PENDING.value}
               }
             )
 
@@ -105,12 +301,13 @@ class TravelBotService:
                 )
 
             request_data = doc.get("request")
-            response_data = doc.get("response")
+            response_data = await self._load_response_data(doc, MongoProfile.PLAN_OWNER_READS)
 
-            travel_request = TravelRequest(**request_data)
-            travel_response = TravelResponse(**response_data)
+            # Stored plans were validated on insert; past trips must still download
+            travel_request = TravelRequest.from_stored(request_data)
+            travel_response = TravelResponse.from_stored(response_data)
 
-            pdf_bytes = pdf_manager.generate_travel_plan_pdf(travel_request, travel_response)
+            pdf_bytes = await pdf_manager.render_travel_plan_pdf(travel_request, travel_response)
             return pdf_bytes
 
         except TravelBotException:
@@ -124,29 +321,172 @@ class TravelBotService:
                 details={"email": email}
             )
 
-    async def get_all_travel_plans(self) -> SuccessResponse[List[TravelRecord]]:
+    async def get_travel_plan(
+        self, email: str, start_date: date, if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[SuccessResponse[Dict[str, Any]]]]:
+        """
+        Return the ETag of the stored plan and, unless the client already
+        holds that version (If-None-Match), the plan JSON. The ETag is the
+        content hash written at persist time, so a revalidation only reads
+        the projected hash and never loads or serializes the plan body.
+        Returns (etag, None) when the client copy is current.
+        """
+        try:
+            # read-your-writes for plans still waiting in the write-behind outbox
+            outbox_entry = plan_outbox.lookup(email, start_date)
+            if outbox_entry:
+                response_data = outbox_entry["response"]
+                etag = f'"{content_hash(response_data)}"'
+                if if_none_match and self._etag_matches(etag, if_none_match):
+                    return etag, None
+                return etag, SuccessResponse(data=response_data, status_code=sc.SUCCESS)
+
+            travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_OWNER_READS)
+            doc = await travel_collection.find_one(
+              {
+                "email": email,
+                **(await self._start_date_match(start_date)),
+                "status": {"$ne": PlanStatus.PENDING.value}
+              },
+              projection={"_id": 1, "body_hash": 1}
+            )
+            if not doc:
+                raise TravelBotException(
+                    message="No travel plan found for the given email and start date",
+                    error_code=sc.ENTITY_NOT_FOUND,
+                    details={"email": email, "start_date": start_date}
+                )
+
+            response_data = None
+            body_hash = doc.get("body_hash")
+            if body_hash is None:
+                # plans stored before the body split have no persisted hash
+                doc = await travel_collection.find_one({"_id": doc["_id"]})
+                response_data = await self._load_response_data(doc, MongoProfile.PLAN_OWNER_READS)
+                body_hash = content_hash(response_data)
 
+            etag = f'"{body_hash}"'
+            if if_none_match and self._etag_matches(etag, if_none_match):
+                return etag, None
+
+            if response_data is None:
+                response_data = await self._load_response_data(doc, MongoProfile.PLAN_OWNER_READS)
+            return etag, SuccessResponse(data=response_data, status_code=sc.SUCCESS)
+
+        except TravelBotException:
+            raise
+        except Exception as exc:
+            raise TravelBotException(
+                message="Failed to fetch travel plan",
+                error_code=sc.INTERNAL_SERVER_ERROR,
+                original_exception=exc,
+                details={"email": email}
+            )
+
+    def _etag_matches(self, etag: str, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        # weak comparison, as required for If-None-Match
+        candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+        return etag in candidates
+
+    async def get_travel_plan_day(self, email: str, start_date: date, day_number: int) -> SuccessResponse[Dict[str, Any]]:
+        """
+        Return a single DayItinerary of a stored plan. Only that day is read
+        from Mongo ($slice projection on the per-day body entries) and it is
+        returned as stored, without validating the whole TravelResponse.
+        """
         try:
-            travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION)
+            not_found = TravelBotException(
+                message="No travel plan day found for the given email, start date and day",
+                error_code=sc.ENTITY_NOT_FOUND,
+                details={"email": email, "start_date": start_date, "day": day_number}
+            )
+            outbox_entry = plan_outbox.lookup(email, start_date)
+            if outbox_entry:
+                days = outbox_entry["response"].get("itinerary", [])[day_number - 1:day_number]
+                if not days:
+                    raise not_found
+                return SuccessResponse(data=days[0], status_code=sc.SUCCESS)
 
-            cursor = travel_collection.find()
-            travel_records: List[TravelRecord] = []
+            day_slice = {"$slice": [day_number - 1, 1]}
 
-            async for doc in cursor:
-              request_data = doc.get("request", {})
-              response_data = doc.get("response", {})
-
-              record = TravelRecord(
-                  email=doc.get("email"),
-                  location=request_data.get("location"),
-                  number_of_days=request_data.get("number_of_days"),
-                  start_date=request_data.get("start_date"),
-                  end_date=response_data.get("end_date")
-              )
-              travel_records.append(record)
+            travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_OWNER_READS)
+            doc = await travel_collection.find_one(
+              {
+                "email": email,
+                **(await self._start_date_match(start_date)),
+                "status": {"$ne": PlanStatus.PENDING.value}
+              },
+              # plans stored before the body split still embed the response
+              projection={"_id": 1, "response.itinerary": day_slice}
+            )
+            if not doc:
+                raise not_found
 
-            return SuccessResponse(data=travel_records, status_code=sc.SUCCESS)
+            if "response" in doc:
+                days = doc["response"].get("itinerary", [])
+            else:
+                plan_body_collection = mongodb_manager.get_collection(CollectionNames.PLAN_BODY, MongoProfile.PLAN_OWNER_READS)
+                body_doc = await plan_body_collection.find_one(
+                    {"_id": doc["_id"]},
+                    projection={"codec": 1, "days": day_slice},
+                )
+                if not body_doc:
+                    raise not_found
+                if "days" in body_doc:
+                    days = decode_plan_days(body_doc)
+                else:
+                    # bodies written before days were split out
+                    itinerary = (await self._load_response_data(doc, MongoProfile.PLAN_OWNER_READS)).get("itinerary", [])
+                    days = itinerary[day_number - 1:day_number]
 
+            if not days:
+                raise not_found
+            return SuccessResponse(data=days[0], status_code=sc.SUCCESS)
+
+        except TravelBotException:
+            raise
+        except Exception as exc:
+            raise TravelBotException(
+                message="Failed to fetch travel plan day",
+                error_code=sc.INTERNAL_SERVER_ERROR,
+                original_exception=exc,
+                details={"email": email}
+            )
+
+    async def get_all_travel_plans(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        filters: Optional[TravelRecordFilter] = None,
+    ) -> SuccessResponse[TravelRecordPage]:
+        """
+        Return one page of travel records, newest first. Pages are keyed on
+        _id: pass the returned next_cursor to fetch the following page.
+        """
+        try:
+            query = await self._build_travel_record_query(filters)
+            if cursor:
+                query["_id"] = {"$lt": self._decode_cursor(cursor)}
+
+            travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_READS)
+            # one extra document tells whether another page exists
+            docs = await travel_collection.find(query, projection=TRAVEL_RECORD_PROJECTION) \
+                .sort("_id", DESCENDING) \
+                .limit(limit + 1) \
+                .to_list(length=limit + 1)
+
+            next_cursor = str(docs[limit - 1]["_id"]) if len(docs) > limit else None
+            travel_records: List[TravelRecord] = [self._to_travel_record(doc) for doc in docs[:limit]]
+
+            return SuccessResponse(
+                data=TravelRecordPage(records=travel_records, next_cursor=next_cursor),
+                status_code=sc.SUCCESS
+            )
+
+        except TravelBotException:
+            raise
         except Exception as exc:
             raise TravelBotException(
                 message="Failed to fetch travel plans",
@@ -154,5 +494,276 @@ class TravelBotService:
                 original_exception=exc
             )
 
+    async def stream_all_travel_plans(self, filters: Optional[TravelRecordFilter] = None) -> AsyncIterator[bytes]:
+        """
+        Stream every matching travel record as newline-delimited JSON.
+        Only one cursor batch is held in memory at a time.
+        """
+        query = await self._build_travel_record_query(filters)
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_READS)
+        docs = travel_collection.find(query, projection=TRAVEL_RECORD_PROJECTION, batch_size=1000) \
+            .sort("_id", DESCENDING)
+        try:
+            async for doc in docs:
+                yield self._to_travel_record(doc).model_dump_json().encode("utf-8") + b"\n"
+        finally:
+            await docs.close()
+
+    def validate_export_format(self, export_format: str) -> None:
+        """Fail fast, before a streaming response has started, on an unusable export format."""
+        if export_format not in plan_export_manager.EXPORT_FORMATS:
+            raise TravelBotException(
+                message=f"Unsupported export format '{export_format}'",
+                error_code=sc.VALIDATION_ERROR,
+                details={"supported_formats": list(plan_export_manager.EXPORT_FORMATS)}
+            )
+        if export_format == plan_export_manager.PARQUET_FORMAT and importlib.util.find_spec("pyarrow") is None:
+            raise TravelBotException(
+                message="Parquet export requires the pyarrow package",
+                error_code=sc.VALIDATION_ERROR
+            )
+
+    async def export_plan_rows(
+        self,
+        export_format: str,
+        filters: Optional[TravelRecordFilter] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream plans flattened to one row per activity as CSV or Parquet.
+        Summaries are read with a batched, projected cursor and the bodies of
+        each batch are fetched with a single $in query, so at most one batch
+        of plans is in memory at a time.
+        """
+        self.validate_export_format(export_format)
+        async for chunk in plan_export_manager.write_rows(export_format, self._iter_plan_row_batches(filters, batch_size)):
+            if chunk:
+                yield chunk
+
+    async def _iter_plan_row_batches(self, filters: Optional[TravelRecordFilter], batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_READS)
+        plan_body_collection = mongodb_manager.get_collection(CollectionNames.PLAN_BODY, MongoProfile.PLAN_READS)
+        query = await self._build_travel_record_query(filters)
+        cursor = travel_collection.find(
+            query,
+            projection={"_id": 1, "email": 1, "request": 1, "summary": 1, "response": 1},
+            batch_size=batch_size,
+        )
+        try:
+            batch: List[Dict[str, Any]] = []
+            async for doc in cursor:
+                batch.append(doc)
+                if len(batch) == batch_size:
+                    yield await self._flatten_batch(batch, plan_body_collection)
+                    batch = []
+            if batch:
+                yield await self._flatten_batch(batch, plan_body_collection)
+        finally:
+            await cursor.close()
+
+    async def _flatten_batch(self, docs: List[Dict[str, Any]], plan_body_collection) -> List[Dict[str, Any]]:
+        body_ids = [doc["_id"] for doc in docs if "response" not in doc]
+        bodies: Dict[Any, Dict[str, Any]] = {}
+        if body_ids:
+            async for body_doc in plan_body_collection.find({"_id": {"$in": body_ids}}):
+                bodies[body_doc["_id"]] = body_doc
+
+        rows: List[Dict[str, Any]] = []
+        for doc in docs:
+            if "response" in doc:
+                response_data = doc["response"]
+            elif doc["_id"] in bodies:
+                response_data = decode_plan_body(bodies[doc["_id"]])
+            else:
+                logger.warning(f"Skipping plan {doc['_id']} without a body during export")
+                continue
+            rows.extend(plan_export_manager.flatten_plan(doc, response_data))
+        return rows
+
+    async def _load_response_data(self, doc: Dict[str, Any], profile: str = MongoProfile.PLAN_READS) -> Dict[str, Any]:
+        """
+        Load the plan response for a travel_collection document from the
+        plan_body collection. Documents stored before the split still embed
+        the response and are served from it until migrated. Read the body
+        with the same profile as the summary, so a primary read is not
+        followed by a lagging secondary.
+        """
+        if "response" in doc:
+            return doc["response"]
+
+        plan_body_collection = mongodb_manager.get_collection(CollectionNames.PLAN_BODY, profile)
+        body_doc = await plan_body_collection.find_one({"_id": doc["_id"]})
+        if not body_doc:
+            raise TravelBotException(
+                message="Travel plan body is missing",
+                error_code=sc.ENTITY_NOT_FOUND,
+                details={"plan_id": str(doc["_id"])}
+            )
+        return decode_plan_body(body_doc)
+
+    async def _build_travel_record_query(self, filters: Optional[TravelRecordFilter]) -> Dict[str, Any]:
+        # pending reservations have no response yet
+        query: Dict[str, Any] = {"status": {"$ne": PlanStatus.PENDING.value}}
+        if not filters:
+            return query
+
+        if filters.email:
+            query["email"] = filters.email
+
+        summary_match: Dict[str, Any] = {}
+        legacy_match: Dict[str, Any] = {"summary": {"$exists": False}}
+        if filters.location:
+            summary_match["summary.location"] = filters.location
+            legacy_match["request.location"] = filters.location
+
+        date_filter: Dict[str, Any] = {}
+        if filters.from_date:
+            date_filter["$gte"] = datetime.combine(filters.from_date, time.min)
+        if filters.to_date:
+            date_filter["$lte"] = datetime.combine(filters.to_date, time.min)
+        if date_filter:
+            summary_match["summary.start_date"] = date_filter
+            # older documents hold the start date as an ISO string, which sorts like the date
+            legacy_match["request.start_date"] = {op: value.isoformat() for op, value in date_filter.items()}
+
+        if summary_match:
+            if await self._summary_backfill_done():
+                query.update(summary_match)
+            else:
+                query["$or"] = [summary_match, legacy_match]
+
+        return query
+
+    async def _start_date_match(self, start_date: date) -> Dict[str, Any]:
+        start_datetime = datetime.combine(start_date, time.min)
+        if await self._summary_backfill_done():
+            return {"summary.start_date": start_datetime}
+        return {"$or": [
+            {"summary.start_date": start_datetime},
+            # stored before the summary; covered by email_request_start_date_idx
+            {"summary": {"$exists": False}, "request.start_date": start_datetime.isoformat()},
+        ]}
+
+    async def _summary_backfill_done(self) -> bool:
+        """
+        Whether migrations/travel_summary_migration.py has finished. Until it
+        has, queries also match the request.* fields of plans that have no
+        summary yet. Re-checked at most every SUMMARY_MIGRATION_CHECK_SECONDS.
+        """
+        if self._summary_backfilled:
+            return True
+        now = asyncio.get_running_loop().time()
+        if self._summary_checked_at is None or now - self._summary_checked_at >= SUMMARY_MIGRATION_CHECK_SECONDS:
+            self._summary_checked_at = now
+            migrations = mongodb_manager.get_collection(CollectionNames.MIGRATIONS)
+            checkpoint = await migrations.find_one({"_id": SUMMARY_MIGRATION_ID}, projection={"done": 1})
+            self._summary_backfilled = bool(checkpoint and checkpoint.get("done"))
+        return self._summary_backfilled
+
+    def _decode_cursor(self, cursor: str) -> ObjectId:
+        try:
+            return ObjectId(cursor)
+        except (InvalidId, TypeError) as exc:
+            raise TravelBotException(
+                message="Invalid pagination cursor",
+                error_code=sc.VALIDATION_ERROR,
+                original_exception=exc,
+                details={"cursor": cursor}
+            )
+
+    def _to_travel_record(self, doc: Dict[str, Any]) -> TravelRecord:
+        summary = doc.get("summary")
+        if summary is None:
+            # not yet backfilled by travel_summary_migration
+            request_data = doc.get("request", {})
+            response_data = doc.get("response", {})
+            return TravelRecord(
+                email=doc.get("email"),
+                location=request_data.get("location"),
+                number_of_days=request_data.get("number_of_days"),
+                start_date=parse_stored_date(request_data.get("start_date")),
+                end_date=parse_stored_date(response_data.get("end_date"))
+            )
+
+        return TravelRecord(
+            email=summary.get("email"),
+            location=summary.get("location"),
+            number_of_days=summary.get("number_of_days"),
+            start_date=summary.get("start_date"),
+            end_date=summary.get("end_date")
+        )
+
+    async def export_travel_plans(self, from_date: Optional[date] = None, to_date: Optional[date] = None) -> AsyncIterator[bytes]:
+        """
+        Stream a ZIP archive with one PDF per stored plan whose start date
+        falls within [from_date, to_date]. PDFs are rendered in the process
+        pool with at most PLAN_EXPORT_CONCURRENCY renders in flight, and each
+        entry is flushed to the caller as soon as it is written, so memory
+        stays bounded regardless of the archive size.
+        """
+        logger.info(f"Exporting travel plans from_date={from_date}, to_date={to_date}")
+
+        query = await self._build_travel_record_query(TravelRecordFilter(from_date=from_date, to_date=to_date))
+
+        travel_collection = mongodb_manager.get_collection(CollectionNames.TRAVEL_COLLECTION, MongoProfile.PLAN_READS)
+        cursor = travel_collection.find(query, batch_size=settings.PLAN_EXPORT_CONCURRENCY * 2)
+
+        stream = StreamBuffer()
+        archive = zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED)
+        pending: set[asyncio.Task] = set()
+        exported = 0
+
+        def write_entry(task: asyncio.Task) -> None:
+            nonlocal exported
+            try:
+                entry_name, pdf_bytes = task.result()
+            except Exception as exc:
+                logger.error(f"Skipping travel plan during export: {str(exc)}")
+                return
+            # PDFs are already compressed by reportlab, so entries are stored as-is
+            archive.writestr(entry_name, pdf_bytes)
+            exported += 1
+
+        try:
+            async for doc in cursor:
+                pending.add(asyncio.create_task(self._render_export_entry(doc)))
+                if len(pending) >= settings.PLAN_EXPORT_CONCURRENCY:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        write_entry(task)
+                    chunk = stream.drain()
+                    if chunk:
+                        yield chunk
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    write_entry(task)
+                chunk = stream.drain()
+                if chunk:
+                    yield chunk
+
+            archive.close()
+            yield stream.drain()
+            logger.info(f"Exported {exported} travel plans")
+
+        finally:
+            for task in pending:
+                task.cancel()
+            await cursor.close()
+
+    async def _render_export_entry(self, doc: Dict[str, Any]) -> tuple[str, bytes]:
+        request_data = doc.get("request", {})
+        response_data = await self._load_response_data(doc)
+
+        # Stored requests were validated on insert and may now start in the past
+        travel_request = TravelRequest.from_stored(request_data)
+        travel_response = TravelResponse.from_stored(response_data)
+
+        pdf_bytes = await pdf_manager.render_travel_plan_pdf(travel_request, travel_response)
+        start_date = str(request_data.get("start_date", ""))[:10]
+        entry_name = f"{doc.get('email')}/{start_date}-{doc.get('_id')}.pdf"
+        return entry_name, pdf_bytes
+
 
 travelbot_service = TravelBotService()
@@ -1,14 +1,31 @@
+import json
+from typing import Any, Union
+
 from fastapi.responses import JSONResponse,Response
+from pydantic import BaseModel
 from models.api_responses import SuccessResponse,ErrorResponse
-from typing import Union
 from models.status_code import sc
 
-def to_json_response(result: Union[SuccessResponse, ErrorResponse]) -> Union[JSONResponse | Response]:
+
+class PydanticJSONResponse(JSONResponse):
+  """
+  JSON response that serializes pydantic models with model_dump_json, in one
+  native pass straight to bytes, instead of model_dump to a dict followed by
+  json.dumps. None fields are left out, as before. Anything else (plain
+  dicts returned by a route) is rendered like JSONResponse does.
+  """
+
+  def render(self, content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+      return content.model_dump_json(exclude_none=True).encode("utf-8")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def to_json_response(result: Union[SuccessResponse, ErrorResponse]) -> Union[PydanticJSONResponse | Response]:
 
   if result.status_code == sc.NO_CONTENT:
     return Response(status_code=sc.NO_CONTENT)
   else:
-    return JSONResponse(
-          content=result.model_dump(exclude_none=True, mode='json'),
+    return PydanticJSONResponse(
+          content=result,
           status_code=result.status_code)
-
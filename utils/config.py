@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 import os
 from pathlib import Path
 
@@ -7,8 +7,21 @@ from pathlib import Path
 class Settings(BaseSettings):
     APP_PORT: int
     DEV_MODE: bool
+    LOG_LEVEL: Optional[str] = None  # defaults to DEBUG in DEV_MODE, INFO otherwise
+    LOG_JSON: bool = False  # one JSON object per line instead of the text format
+    LOG_SAMPLE_EVERY: int = 100  # keep 1 in N of the high-volume messages
     JWT_SECRET_KEY: str
     JWT_EXPIRATION: int = 86400000  # Default 24 hours in milliseconds
+    JWT_CLAIMS_CACHE_SIZE: int = 10000  # verified tokens kept in memory
+    TOKEN_DENYLIST_REFRESH_SECONDS: float = 5.0
+    TOKEN_DENYLIST_REBUILD_SECONDS: float = 3600.0  # full reload that also drops expired revocations
+    TOKEN_DENYLIST_BLOOM_CAPACITY: int = 100000
+    TOKEN_DENYLIST_BLOOM_FALSE_POSITIVE_RATE: float = 0.001
+    BCRYPT_ROUNDS: int = 12  # cost factor; older hashes are upgraded at the next sign-in
+    BCRYPT_WORKERS: int = 4  # threads, and so concurrent hashes
+    BCRYPT_QUEUE_TIMEOUT_SECONDS: float = 2.0  # longer waits for a thread are shed with 429
+    BCRYPT_IMPORT_WORKERS: int = 2  # threads hashing passwords of bulk user imports
+    USER_IMPORT_BATCH_SIZE: int = 1000
     ALLOWED_ROLES: str
     ALLOWED_PERMISSIONS: str
     MONGO_HOST: str = "localhost"
@@ -21,10 +34,44 @@ class Settings(BaseSettings):
     POSTGRE_USER: str
     POSTGRE_PASSWORD: str
     POSTGRE_DATABASE: str
+    POSTGRE_POOL_MIN_SIZE: int = 2
+    POSTGRE_POOL_MAX_SIZE: int = 20
+    POSTGRE_STATEMENT_TIMEOUT_MS: int = 30000
+    POSTGRE_STATEMENT_CACHE_SIZE: int = 100  # prepared statements kept per connection
+    POSTGRE_CONN_MAX_QUERIES: int = 50000  # a connection is replaced after this many queries
+    POSTGRE_CONN_MAX_INACTIVE_LIFETIME_SECONDS: float = 300.0
     OPENAI_API_KEY: str
     OPENAI_DEFAULT_MODEL: str
     OPENAI_MAX_TOKENS: int
     OPENAI_TEMPERATURE: float
+    PDF_RENDER_WORKERS: int = 2
+    PDF_FONT_DIR: str = "fonts"
+    PLAN_EXPORT_CONCURRENCY: int = 4
+    PLAN_RESERVATION_TTL_SECONDS: int = 600
+    PLAN_CACHE_MAX_AGE_SECONDS: int = 86400
+    PLAN_WRITE_BEHIND: bool = False
+    PLAN_OUTBOX_PATH: str = "data/plan_outbox.log"
+    PLAN_OUTBOX_BATCH_SIZE: int = 100
+    PLAN_OUTBOX_RETRY_DELAY_SECONDS: float = 0.5
+    PLAN_OUTBOX_MAX_RETRY_DELAY_SECONDS: float = 30.0
+    PLAN_OUTBOX_MAX_ATTEMPTS: int = 5  # non-transient failures before a batch is split and bad plans dead-lettered
+    ANALYTICS_REFRESH_SECONDS: int = 300
+    ANALYTICS_REFRESH_LEASE_SECONDS: int = 600  # a crashed instance's refresh lease is taken over after this
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_CONNECT_TIMEOUT_MS: int = 20000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGO_COMPRESSORS: str = "zlib"  # zstd needs the zstandard package, snappy python-snappy; missing codecs are skipped silently
+    MONGO_PLAN_READ_PREFERENCE: Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"] = "secondaryPreferred"
+    MONGO_PLAN_READ_MAX_STALENESS_SECONDS: int = -1  # -1 = no staleness limit, otherwise at least 90
+    MONGO_PLAN_WRITE_W: str = "1"  # a number of members or "majority"
+    MONGO_PLAN_WRITE_JOURNAL: Optional[bool] = None
+    MONGO_PLAN_WRITE_TIMEOUT_MS: Optional[int] = None
 
 
     model_config = {"env_file": ".env"}
@@ -1,7 +1,9 @@
 from .mongo_db_manager import mongodb_manager
 from .postgre_db_manager import postgre_manager
 from .logger import logger
-from typing import Dict, Any
+from typing import Dict, Any, Awaitable, Optional
+import asyncio
+import time
 
 class DataSourcesManager:
     """
@@ -11,33 +13,64 @@ class DataSourcesManager:
         self.mongodb = mongodb_manager
         self.postgresql = postgre_manager
         self.is_connected = False
+        self.startup_timings: Dict[str, float] = {}
+        self._index_task: Optional[asyncio.Task] = None
 
     async def connect_all(self):
         """
-        Connect to both MongoDB and PostgreSQL databases
+        Connect to MongoDB and PostgreSQL concurrently. The MongoDB indexes
+        that duplicate rejection and reservation expiry rely on are built
+        before startup completes; the others are built in the background.
         """
         try:
             logger.info("Initializing database connections...")
+            started = time.perf_counter()
 
-            # Connect to MongoDB
-            await self.mongodb.connect()
+            await asyncio.gather(
+                self._timed("mongodb_connect_ms", self.mongodb.connect()),
+                self._timed("postgresql_connect_ms", self.postgresql.connect()),
+            )
+            self.startup_timings["connect_all_ms"] = (time.perf_counter() - started) * 1000
 
-            # Connect to PostgreSQL
-            await self.postgresql.connect()
+            await self._timed("mongodb_critical_indexes_ms", self.mongodb.ensure_critical_indexes())
+            self._index_task = asyncio.create_task(self._timed("mongodb_indexes_ms", self.mongodb.ensure_indexes()))
 
             self.is_connected = True
-            logger.info("All database connections established successfully")
+            logger.info(f"All database connections established successfully, timings={self.startup_timings}")
 
         except Exception as e:
             logger.error(f"Failed to establish database connections: {str(e)}")
             await self.disconnect_all()
             raise
 
+    async def _timed(self, phase: str, operation: Awaitable[Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return await operation
+        finally:
+            self.startup_timings[phase] = (time.perf_counter() - started) * 1000
+
+    def readiness(self) -> Dict[str, Any]:
+        """
+        Readiness snapshot: ready once both connection pools are warm and the
+        critical MongoDB indexes exist. The background index builds are
+        reported but do not hold back readiness.
+        """
+        return {
+            "ready": bool(self.is_connected and self.mongodb and self.mongodb.critical_indexes_ready),
+            "indexes_ready": bool(self.mongodb and self.mongodb.indexes_ready),
+            "startup_timings_ms": {phase: round(ms, 1) for phase, ms in self.startup_timings.items()},
+        }
+
     async def disconnect_all(self):
         """
         Disconnect from both databases
         """
         try:
+            self.is_connected = False
+            if self._index_task and not self._index_task.done():
+                self._index_task.cancel()
+
             if self.mongodb:
                 await self.mongodb.disconnect()
                 self.mongodb = None
@@ -46,7 +79,6 @@ class DataSourcesManager:
                 await self.postgresql.disconnect()
                 self.postgresql = None
 
-            self.is_connected = False
             logger.info("All database connections closed")
 
         except Exception as e:
@@ -56,8 +88,10 @@ class DataSourcesManager:
         """
         Perform health check on both databases
         """
-        mongodb_status = await self.mongodb.health_check()
-        postgresql_status = await self.postgresql.health_check()
+        mongodb_status, postgresql_status = await asyncio.gather(
+            self.mongodb.health_check(),
+            self.postgresql.health_check(),
+        )
 
         return {
             "mongodb": {
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .config import settings
+from .data_sources_manager import data_sources_manager
+from .logger import logger
+
+
+class _StoreHealth:
+    """Latest probe result of one data store"""
+
+    def __init__(self):
+        self.connected = False
+        self.latency_ms: Optional[float] = None
+        self.consecutive_failures = 0
+        self.last_checked: Optional[str] = None
+
+    def to_dict(self, pool: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "status": "healthy" if self.connected else "unhealthy",
+            "connected": self.connected,
+            "latency_ms": self.latency_ms,
+            "consecutive_failures": self.consecutive_failures,
+            "last_checked": self.last_checked,
+            "pool": pool,
+        }
+
+
+class HealthProber:
+    """
+    Probes MongoDB and PostgreSQL concurrently on a fixed interval and keeps
+    the latest result in memory, so /health/database answers from the cached
+    snapshot instead of running a ping and a SELECT 1 per request.
+    """
+
+    def __init__(self):
+        self.mongodb = _StoreHealth()
+        self.postgresql = _StoreHealth()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._probe_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe_periodically(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"Database health probe failed: {str(e)}")
+            await asyncio.sleep(settings.HEALTH_PROBE_INTERVAL_SECONDS)
+
+    async def probe(self) -> None:
+        await asyncio.gather(
+            self._probe_store(self.mongodb, data_sources_manager.mongodb.health_check),
+            self._probe_store(self.postgresql, data_sources_manager.postgresql.health_check),
+        )
+
+    async def _probe_store(self, store: _StoreHealth, check: Callable[[], Awaitable[bool]]) -> None:
+        started = time.perf_counter()
+        try:
+            connected = await asyncio.wait_for(check(), timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.error(f"Database health probe timed out or failed: {str(e)}")
+            connected = False
+        store.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        store.connected = connected
+        store.consecutive_failures = 0 if connected else store.consecutive_failures + 1
+        store.last_checked = datetime.now(timezone.utc).isoformat()
+
+    def snapshot(self) -> Dict[str, Any]:
+        mongodb = data_sources_manager.mongodb
+        postgresql = data_sources_manager.postgresql
+        return {
+            "mongodb": self.mongodb.to_dict(mongodb.pool_stats() if mongodb else {}),
+            "postgresql": self.postgresql.to_dict(postgresql.pool_stats() if postgresql else {}),
+            "overall_status": "healthy" if (self.mongodb.connected and self.postgresql.connected) else "degraded",
+        }
+
+
+#global instance
+health_prober = HealthProber()
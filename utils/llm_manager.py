@@ -2,7 +2,9 @@ from collections import Counter
 from langchain_core.documents import Document
 from typing import Any, Dict, List
 import json
+import logging
 import re
+from pydantic import ValidationError
 from utils.logger import logger
 from utils.prompt_templates import TRAVEL_PLAN_GENERATION_PROMPT
 from models.travel_models import *
@@ -93,16 +95,15 @@ def _fix_common_json_issues(json_str: str, error_pos: int = None) -> str:
     return fixed
 
 
-def _parse_llm_response(response_content: str) -> Dict[str, Any]:
+def _repair_json(json_str: str) -> str:
     """
-    Parse LLM response and handle common JSON parsing errors.
-    Logs the problematic JSON for debugging if parsing fails.
+    Return json_str with common LLM JSON mistakes fixed. Only called once the
+    text failed to parse; json.loads is used here for its error position.
+    Logs the problematic JSON for debugging if it cannot be repaired.
     """
-    json_str = _extract_json_from_response(response_content)
-    
-    # First attempt: try parsing directly
     try:
-        data = json.loads(json_str)
+        json.loads(json_str)
+        return json_str
     except json.JSONDecodeError as e:
         logger.warning(
             f"Initial JSON parsing failed at line {e.lineno}, column {e.colno}: {e.msg}. "
@@ -115,44 +116,51 @@ def _parse_llm_response(response_content: str) -> Dict[str, Any]:
             start = max(0, error_pos - 200)
             end = min(len(json_str), error_pos + 200)
             problematic_section = json_str[start:end]
-            logger.debug(f"Problematic JSON section around error (pos {error_pos}): ...{problematic_section}...")
+            logger.debug("Problematic JSON section around error (pos %s): ...%s...", error_pos, problematic_section)
         
         # Attempt to fix common issues, passing error position for targeted fixes
         fixed_json = _fix_common_json_issues(json_str, error_pos)
         
         try:
             # Second attempt with fixed JSON
-            data = json.loads(fixed_json)
+            json.loads(fixed_json)
             logger.info("Successfully parsed JSON after applying fixes")
+            return fixed_json
         except json.JSONDecodeError as e2:
             # If still failing, log the full response for debugging
             logger.error(
                 f"Failed to parse JSON even after fixes. Error at line {e2.lineno}, "
                 f"column {e2.colno}: {e2.msg}. Full response length: {len(json_str)} chars"
             )
-            logger.debug(f"Full JSON response (first 5000 chars): {json_str[:5000]}")
-            logger.debug(f"Full JSON response (last 5000 chars): {json_str[-5000:]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Full JSON response (first 5000 chars): %s", json_str[:5000])
+                logger.debug("Full JSON response (last 5000 chars): %s", json_str[-5000:])
             raise ValueError(
                 f"Invalid JSON in LLM response. Parse error at line {e2.lineno}, "
                 f"column {e2.colno}: {e2.msg}"
             ) from e2
-    
-    # Validate the parsed structure
-    if not isinstance(data, dict):
-        raise ValueError("Parsed JSON is not a dictionary")
-    
-    if "location" not in data:
-        raise ValueError("Missing 'location' field in JSON response")
-    
-    if "sightseeing_places" not in data or not isinstance(data["sightseeing_places"], list):
-        raise ValueError("Missing or invalid 'sightseeing_places' field in JSON response")
 
-    return data
+
+def _parse_llm_response(response_content: str) -> TravelResponse:
+    """
+    Validate the LLM response text straight into a TravelResponse with
+    model_validate_json: one native parse + validate pass, no intermediate
+    dict. Text that is not valid JSON is repaired and validated again.
+    """
+    json_str = _extract_json_from_response(response_content)
+    try:
+        return TravelResponse.model_validate_json(json_str)
+    except ValidationError as e:
+        if not any(error["type"] == "json_invalid" for error in e.errors()):
+            raise
+    return TravelResponse.model_validate_json(_repair_json(json_str))
 
 async def generate_travel_plan(travel_request: TravelRequest) -> TravelResponse:
     request_data = _get_request_data(travel_request)
     travel_chain = _get_travel_plan_generation_chain()
     response = await travel_chain.ainvoke(request_data)
-    response_content = _parse_llm_response(response.content)
-    logger.debug(f"response_content=\n{json.dumps(response_content,indent=4)}")
-    return TravelResponse(**response_content)
+    travel_response = _parse_llm_response(response.content)
+    if logger.isEnabledFor(logging.DEBUG):
+        # the pretty-printed dump costs more than the parse; skip it unless it is logged
+        logger.debug("response_content=\n%s", travel_response.model_dump_json(indent=4, exclude_none=True))
+    return travel_response
@@ -1,31 +1,165 @@
+import atexit
+import contextvars
+import itertools
+import json
 import logging
 import logging.handlers
 import os
-from datetime import datetime
+import queue
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from .config import settings
+
+# Request id of the HTTP request being handled, set by RequestIdMiddleware
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+# Pass as extra= on high-volume messages; only 1 in LOG_SAMPLE_EVERY of them per call site is kept
+SAMPLED = {"sampled": True}
+
+REQUEST_ID_HEADER = "X-Request-ID"
 
 # Create logger
 logger = logging.getLogger("Ai-QuizBot")
-logger.setLevel(logging.DEBUG)  # minimum log level
-
-
-# Create logs directory
-log_directory = "logs"
-os.makedirs(log_directory, exist_ok=True)
-
-# Rotating file handler (similar to logback's size-based rotation)
-# Max file size: 10MB, keep 5 backup files
-rotating_file_handler = logging.handlers.RotatingFileHandler(
-    filename=f"{log_directory}/app.log",
-    maxBytes=10 * 1024 * 1024,  # 10MB
-    backupCount=5,
-    encoding='utf-8'
-)
-
-# Log Format
-formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
-)
-rotating_file_handler.setFormatter(formatter)
-
-# Add handlers to logger
-logger.addHandler(rotating_file_handler)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps the current request id on every record, in the thread that logs it"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in `every` records marked with extra=SAMPLED, counted per call site"""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counters = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or self.every == 1:
+            return True
+        site = (record.pathname, record.lineno)
+        counter = self._counters.get(site)
+        if counter is None:
+            counter = self._counters[site] = itertools.count()
+        return next(counter) % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: str, json_output: bool, file_handler: Optional[logging.Handler] = None) -> None:
+    """
+    (Re)configure the app logger. Callers only put records on an in-memory
+    queue; a QueueListener thread formats them and does the file I/O and
+    rotation, so logging never blocks the event loop.
+    """
+    global _listener
+    stop_logging()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+    if file_handler is None:
+        # Create logs directory
+        log_directory = "logs"
+        os.makedirs(log_directory, exist_ok=True)
+
+        # Rotating file handler (similar to logback's size-based rotation)
+        # Max file size: 10MB, keep 5 backup files
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename=f"{log_directory}/app.log",
+            maxBytes=10 * 1024 * 1024,  # 10MB
+            backupCount=5,
+            encoding='utf-8'
+        )
+
+    # Log Format
+    if json_output:
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(levelname)s - [%(request_id)s] - %(filename)s:%(lineno)d - %(message)s"
+        ))
+
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_EVERY))
+    queue_handler.addFilter(RequestIdFilter())
+    logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware that gives every HTTP request an id (the incoming
+    X-Request-ID header or a new one), exposes it to log records and echoes
+    it in the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER.lower().encode("latin-1"), request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+configure_logging(settings.LOG_LEVEL or ("DEBUG" if settings.DEV_MODE else "INFO"), settings.LOG_JSON)
+atexit.register(stop_logging)
@@ -1,41 +1,298 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from .logger import logger
 from .config import settings
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+from pymongo.write_concern import WriteConcern
 from mongo_collection_names import CollectionNames
 
+# Indexes per collection. ensure_indexes() builds the missing ones and brings
+# existing ones with the same name in line with the definition here.
+INDEXES: Dict[str, List[IndexModel]] = {
+    CollectionNames.TRAVEL_COLLECTION: [
+        #create unique index on email + start_date
+        IndexModel(
+            [("email", ASCENDING), ("request.start_date", ASCENDING)],
+            unique=True,
+            name="email_request_start_date_idx",
+        ),
+        #expire plan reservations whose generation never completed
+        IndexModel(
+            [("reserved_at", ASCENDING)],
+            expireAfterSeconds=settings.PLAN_RESERVATION_TTL_SECONDS,
+            partialFilterExpression={"status": "pending"},
+            name="pending_reserved_at_ttl_idx",
+        ),
+        #plan lookups by user and start date (download, per-user listing)
+        IndexModel(
+            [("email", ASCENDING), ("summary.start_date", ASCENDING)],
+            name="email_summary_start_date_idx",
+        ),
+        #keyset pagination of the admin plan listing, sorted by _id. Keys follow
+        #equality, sort, range: the start date range comes after _id, so pages
+        #stay in index order and the range is checked on the index keys,
+        #with no in-memory sort
+        IndexModel(
+            [("email", ASCENDING), ("_id", DESCENDING), ("summary.start_date", ASCENDING)],
+            name="email_id_start_date_idx",
+        ),
+        IndexModel(
+            [("summary.location", ASCENDING), ("_id", DESCENDING), ("summary.start_date", ASCENDING)],
+            name="summary_location_id_start_date_idx",
+        ),
+        IndexModel(
+            [("_id", DESCENDING), ("summary.start_date", ASCENDING)],
+            name="id_summary_start_date_idx",
+        ),
+        #unsorted start date range scans (export)
+        IndexModel(
+            [("summary.start_date", ASCENDING), ("_id", DESCENDING)],
+            name="summary_start_date_id_idx",
+        ),
+        #the few plans stored after the analytics watermark passed their _id
+        IndexModel(
+            [("analytics_late", ASCENDING)],
+            sparse=True,
+            name="analytics_late_idx",
+        ),
+    ],
+    CollectionNames.PLAN_ANALYTICS: [
+        #dashboard reads of the analytics buckets, largest first
+        IndexModel(
+            [("_id.dimension", ASCENDING), ("plans", DESCENDING)],
+            name="dimension_plans_idx",
+        ),
+    ],
+}
+
+# Indexes that correctness depends on: the unique index is the duplicate plan
+# check and the TTL index expires abandoned reservations. They are built before
+# the app reports ready; the others are built in the background.
+CRITICAL_INDEXES = {"email_request_start_date_idx", "pending_reserved_at_ttl_idx"}
+
+# Index options compared against the existing index; changing any of them (or
+# the keys) needs a rebuild. expireAfterSeconds is changed in place with collMod.
+_REBUILD_OPTIONS = ("unique", "sparse", "partialFilterExpression")
+
+
+def _index_spec(index: Dict[str, Any]) -> Dict[str, Any]:
+    """Keys and rebuild options of an IndexModel document or index_information() entry"""
+    keys = index["key"].items() if isinstance(index["key"], dict) else index["key"]
+    spec = {"key": [(field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in keys]}
+    for option in _REBUILD_OPTIONS:
+        spec[option] = index.get(option) or None
+    return spec
+
+
+class MongoProfile:
+    """
+    Named per-operation profiles, applied with get_collection(name, profile).
+    Operations without a profile use the client defaults (primary reads,
+    acknowledged writes).
+    """
+    # admin listings, exports and analytics, which tolerate replication lag
+    PLAN_READS = "plan_reads"
+    # a user reading back their own plan right after creating it: always the primary
+    PLAN_OWNER_READS = "plan_owner_reads"
+    # the hot plan insert path
+    PLAN_WRITES = "plan_writes"
+
+
+# keyed by the modes Settings.MONGO_PLAN_READ_PREFERENCE accepts
+_READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def _build_read_preference(mode: str, max_staleness_seconds: int):
+    if mode == "primary":
+        return Primary()
+    return _READ_PREFERENCES[mode](max_staleness=max_staleness_seconds)
+
+
+def _build_write_concern(w: str, journal: Optional[bool], timeout_ms: Optional[int]) -> WriteConcern:
+    return WriteConcern(w=int(w) if w.isdigit() else w, j=journal, wtimeout=timeout_ms)
+
+
+def _client_options() -> Dict[str, Any]:
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+        "compressors": settings.MONGO_COMPRESSORS,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+class PoolStatsListener(ConnectionPoolListener):
+    """
+    Counts connection pool events, since pymongo has no public pool
+    statistics API. Counters cover every server the client talks to.
+    """
+
+    def __init__(self):
+        self.open_connections = 0
+        self.in_use_connections = 0
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_closed(self, event):
+        self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_checked_out(self, event):
+        self.in_use_connections += 1
+
+    def connection_checked_in(self, event):
+        self.in_use_connections = max(0, self.in_use_connections - 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+
 class MongoDBManager:
     def __init__(self):
         self.client: Optional[AsyncIOMotorClient] = None
         self.database = None
+        self.critical_indexes_ready = False
+        self.indexes_ready = False
+        self.pool_listener = PoolStatsListener()
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self._profiled_collections: Dict[tuple, Any] = {}
 
     async def connect(self):
         try:
             logger.info(f"connecting to MongoDB: {settings.MONGODB_DATABASE}")
 
-            self.client = AsyncIOMotorClient(settings.mongo_db_url)
+            self.client = AsyncIOMotorClient(
+                settings.mongo_db_url,
+                event_listeners=[self.pool_listener],
+                **_client_options(),
+            )
             self.database = self.client[settings.MONGODB_DATABASE]
+            self._profiled_collections = {}
+            self.profiles = {
+                MongoProfile.PLAN_READS: {
+                    "read_preference": _build_read_preference(
+                        settings.MONGO_PLAN_READ_PREFERENCE, settings.MONGO_PLAN_READ_MAX_STALENESS_SECONDS
+                    ),
+                },
+                MongoProfile.PLAN_OWNER_READS: {
+                    "read_preference": Primary(),
+                },
+                MongoProfile.PLAN_WRITES: {
+                    "write_concern": _build_write_concern(
+                        settings.MONGO_PLAN_WRITE_W, settings.MONGO_PLAN_WRITE_JOURNAL, settings.MONGO_PLAN_WRITE_TIMEOUT_MS
+                    ),
+                },
+            }
 
-            # Create indexes for better performance
-            await self._create_indexes()
+            # Motor connects lazily; ping so the first request finds a warm pool
+            await self.client.admin.command('ping')
 
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise
 
-    async def _create_indexes(self):
+    async def ensure_critical_indexes(self):
+        """
+        Build the missing CRITICAL_INDEXES. Awaited during startup; errors
+        are raised, because without them duplicate plans can be stored.
+        """
+        await self._create_missing_indexes(critical=True)
+        self.critical_indexes_ready = True
+
+    async def ensure_indexes(self):
+        """
+        Build the remaining indexes that do not exist yet. Meant to run in
+        the background after startup; errors are logged.
+        """
         try:
-            #create unique index on email + start_date
-            await self.database[CollectionNames.TRAVEL_COLLECTION].create_index(
-                    [("email", ASCENDING), ("request.start_date", ASCENDING)],
-                    unique=True, 
-                    name="email_request_start_date_idx",
-                )            
-            logger.info("MongoDB indexes created successfully")
+            await self._create_missing_indexes(critical=False)
+            self.indexes_ready = True
+            logger.info("MongoDB indexes are up to date")
         except Exception as e:
             logger.warning(f"Error creating MongoDB indexes: {str(e)}")
 
+    async def _create_missing_indexes(self, critical: bool):
+        # existing indexes are found with one listIndexes call per collection,
+        # so a restart against an up-to-date database does no index work
+        for collection_name, index_models in INDEXES.items():
+            index_models = [index for index in index_models if (index.document["name"] in CRITICAL_INDEXES) == critical]
+            if not index_models:
+                continue
+            collection = self.database[collection_name]
+            existing = await collection.index_information()
+            missing = [index for index in index_models if index.document["name"] not in existing]
+            for index in index_models:
+                if index.document["name"] in existing and await self._sync_index(
+                    collection, index.document, existing[index.document["name"]]
+                ):
+                    missing.append(index)
+            if missing:
+                names = [index.document["name"] for index in missing]
+                logger.info(f"Creating MongoDB indexes on {collection_name}: {names}")
+                await collection.create_indexes(missing)
+
+    async def _sync_index(self, collection, wanted: Dict[str, Any], existing: Dict[str, Any]) -> bool:
+        """
+        Apply a changed definition to an index that already exists under the
+        same name. A new TTL is set in place with collMod. Changed keys or
+        options need a rebuild: the index is dropped and True is returned so
+        it is created again, except for critical indexes, which are never
+        dropped by the app (a missing unique index lets duplicates in) and
+        are only reported. Returns False when nothing needs to be created.
+        """
+        name = wanted["name"]
+        if _index_spec(wanted) != _index_spec(existing):
+            if name in CRITICAL_INDEXES:
+                logger.error(
+                    f"MongoDB index {collection.name}.{name} differs from its definition and must be rebuilt by hand: "
+                    f"existing={_index_spec(existing)} wanted={_index_spec(wanted)}"
+                )
+                return False
+            logger.warning(f"Rebuilding MongoDB index {collection.name}.{name}, its definition changed")
+            await collection.drop_index(name)
+            return True
+
+        expire_after_seconds = wanted.get("expireAfterSeconds")
+        if expire_after_seconds is not None and existing.get("expireAfterSeconds") != expire_after_seconds:
+            logger.warning(
+                f"Changing expireAfterSeconds of MongoDB index {collection.name}.{name} "
+                f"from {existing.get('expireAfterSeconds')} to {expire_after_seconds}"
+            )
+            await self.database.command(
+                {"collMod": collection.name, "index": {"name": name, "expireAfterSeconds": expire_after_seconds}}
+            )
+        return False
+
     async def disconnect(self):
 
         """
@@ -61,10 +318,25 @@ class MongoDBManager:
             logger.error(f"MongoDB health check failed: {str(e)}")
             return False
 
-    def get_collection(self, collection_name: str):
+    def pool_stats(self) -> Dict[str, Any]:
+        open_connections = self.pool_listener.open_connections
+        in_use = self.pool_listener.in_use_connections
+        return {
+            "open": open_connections,
+            "in_use": in_use,
+            "available": max(0, open_connections - in_use),
+            "max_size": self.client.options.pool_options.max_pool_size if self.client else None,
+        }
+
+    def get_collection(self, collection_name: str, profile: Optional[str] = None):
         if self.database is None:
             raise RuntimeError("Database not connected. Call connect() first.")
-        return self.database[collection_name]
+        if profile is None:
+            return self.database[collection_name]
+        key = (collection_name, profile)
+        if key not in self._profiled_collections:
+            self._profiled_collections[key] = self.database[collection_name].with_options(**self.profiles[profile])
+        return self._profiled_collections[key]
 
 
 # Global MongoDB manager instance
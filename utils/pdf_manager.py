@@ -1,12 +1,107 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import os
 from io import BytesIO
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-from models.travel_models import TravelRequest, TravelResponse, DayItinerary, DailyActivity, SightseeingPlace
+from models.travel_models import LanguageEnum, TravelRequest, TravelResponse, DayItinerary, DailyActivity, SightseeingPlace
 from utils.logger import logger
+from utils.config import settings
+
+_cached_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Base-14 fonts need no embedding but only cover Latin-1
+_DEFAULT_FONTS: Tuple[str, str] = ("Helvetica", "Helvetica-Bold")
+
+# (regular, bold) TTF files under PDF_FONT_DIR for scripts Helvetica cannot draw,
+# downloaded by scripts/fetch_fonts.py.
+# reportlab 4.0.7 draws code points in order without OpenType shaping, so Tamil
+# and Devanagari vowel signs that attach before or around a consonant and
+# conjuncts are not composed; the text is readable but not typographically right.
+LANGUAGE_FONT_FILES: Dict[LanguageEnum, Tuple[str, str]] = {
+    LanguageEnum.TAMIL: ("NotoSansTamil-Regular.ttf", "NotoSansTamil-Bold.ttf"),
+    LanguageEnum.HINDI: ("NotoSansDevanagari-Regular.ttf", "NotoSansDevanagari-Bold.ttf"),
+}
+
+# Fonts registered in this process, keyed by language. Fallbacks are not
+# cached, so fonts added later are picked up without a restart.
+_registered_fonts: Dict[LanguageEnum, Tuple[str, str]] = {}
+# Languages whose missing fonts were already warned about
+_warned_fallbacks: set = set()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _cached_process_pool
+    if _cached_process_pool is None:
+        # spawn instead of fork: the parent already runs Motor/asyncpg threads
+        _cached_process_pool = ProcessPoolExecutor(
+            max_workers=settings.PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _cached_process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _cached_process_pool
+    if _cached_process_pool is not None:
+        _cached_process_pool.shutdown(wait=True, cancel_futures=True)
+        _cached_process_pool = None
+        logger.info("PDF render process pool shut down")
+
+
+def _get_fonts(language) -> Tuple[str, str]:
+    """
+    Return the (regular, bold) font names to use for the given language.
+
+    TTF files are parsed and registered with reportlab once per process and
+    reused by every later render. reportlab embeds TTF fonts as subsets, so
+    each PDF only carries the glyphs it actually draws.
+    """
+    try:
+        language = LanguageEnum(language)
+    except ValueError:
+        return _DEFAULT_FONTS
+
+    fonts = _registered_fonts.get(language)
+    if fonts is not None:
+        return fonts
+
+    font_files = LANGUAGE_FONT_FILES.get(language)
+    if font_files is None:
+        return _DEFAULT_FONTS
+
+    try:
+        fonts = tuple(
+            _register_ttf_font(os.path.join(settings.PDF_FONT_DIR, font_file))
+            for font_file in font_files
+        )
+    except Exception as e:
+        if language not in _warned_fallbacks:
+            _warned_fallbacks.add(language)
+            logger.warning(
+                f"Falling back to Helvetica for language='{language.value}', "
+                f"run scripts/fetch_fonts.py: {str(e)}"
+            )
+        return _DEFAULT_FONTS
+
+    _registered_fonts[language] = fonts
+    _warned_fallbacks.discard(language)
+    return fonts
+
+
+def _register_ttf_font(font_path: str) -> str:
+    font_name = os.path.splitext(os.path.basename(font_path))[0]
+    if font_name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(font_name, font_path))
+        logger.info(f"Registered PDF font '{font_name}' from {font_path}")
+    return font_name
 
 
 def _draw_wrapped_text(c: canvas.Canvas, text: str, x: float, y: float, max_width: float, line_height: float) -> float:
@@ -35,12 +130,25 @@ def _draw_wrapped_text(c: canvas.Canvas, text: str, x: float, y: float, max_widt
     return y
 
 
+def _new_page(c: canvas.Canvas, font: str) -> float:
+    """
+    Start a new page and return the top y-position. reportlab resets the
+    font to Helvetica on showPage, which has no Tamil or Hindi glyphs, so
+    the language font is set again.
+    """
+    c.showPage()
+    c.setFont(font, 12)
+    return A4[1] - 2 * cm
+
+
 def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: TravelResponse) -> bytes:
     """
     Generate a PDF file (as bytes) for the given travel request/response.
     """
     logger.info(f"Generating travel plan PDF for location='{travel_request.location}', days={travel_request.number_of_days}")
 
+    regular_font, bold_font = _get_fonts(travel_request.preferred_language)
+
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
@@ -51,12 +159,12 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
     line_height = 14
 
     # Title
-    c.setFont("Helvetica-Bold", 18)
+    c.setFont(bold_font, 18)
     c.drawString(margin_x, y, f"Travel Plan - {travel_response.location}")
     y -= 24
 
     # Basic info
-    c.setFont("Helvetica", 12)
+    c.setFont(regular_font, 12)
     y = _draw_wrapped_text(
         c,
         f"Trip Duration: {travel_response.trip_duration} days "
@@ -78,25 +186,23 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
     y -= line_height
 
     # Overview
-    c.setFont("Helvetica-Bold", 14)
+    c.setFont(bold_font, 14)
     c.drawString(margin_x, y, "Overview")
     y -= 18
-    c.setFont("Helvetica", 12)
+    c.setFont(regular_font, 12)
     y = _draw_wrapped_text(c, travel_response.overview, margin_x, y, max_text_width, line_height)
     y -= line_height
 
     # Sightseeing places
     if travel_response.sightseeing_places:
-        c.setFont("Helvetica-Bold", 14)
+        c.setFont(bold_font, 14)
         c.drawString(margin_x, y, "Sightseeing Places")
         y -= 18
-        c.setFont("Helvetica", 12)
+        c.setFont(regular_font, 12)
 
         for place in travel_response.sightseeing_places:
             if y < 4 * cm:
-                c.showPage()
-                y = height - 2 * cm
-                c.setFont("Helvetica", 12)
+                y = _new_page(c, regular_font)
 
             y = _draw_wrapped_text(c, f"- {place.name} ({place.category})", margin_x, y, max_text_width, line_height)
             if place.description:
@@ -125,19 +231,16 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
     if travel_response.itinerary:
         for day in travel_response.itinerary:
             if y < 5 * cm:
-                c.showPage()
-                y = height - 2 * cm
+                y = _new_page(c, regular_font)
 
-            c.setFont("Helvetica-Bold", 14)
+            c.setFont(bold_font, 14)
             c.drawString(margin_x, y, f"Day {day.day_number} - {day.day_date}: {day.title}")
             y -= 18
 
-            c.setFont("Helvetica", 12)
+            c.setFont(regular_font, 12)
             for activity in day.activities:
                 if y < 4 * cm:
-                    c.showPage()
-                    y = height - 2 * cm
-                    c.setFont("Helvetica", 12)
+                    y = _new_page(c, regular_font)
 
                 title_line = f"{activity.time} - {activity.activity} @ {activity.location}"
                 y = _draw_wrapped_text(c, title_line, margin_x, y, max_text_width, line_height)
@@ -171,8 +274,7 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
 
             if day.meals_suggestions:
                 if y < 4 * cm:
-                    c.showPage()
-                    y = height - 2 * cm
+                    y = _new_page(c, regular_font)
                 y = _draw_wrapped_text(
                     c,
                     "Meals: " + "; ".join(day.meals_suggestions),
@@ -184,8 +286,7 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
 
             if day.accommodation_note:
                 if y < 4 * cm:
-                    c.showPage()
-                    y = height - 2 * cm
+                    y = _new_page(c, regular_font)
                 y = _draw_wrapped_text(
                     c,
                     "Accommodation: " + day.accommodation_note,
@@ -200,21 +301,19 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
     # Additional info
     if travel_response.travel_tips:
         if y < 4 * cm:
-            c.showPage()
-            y = height - 2 * cm
-        c.setFont("Helvetica-Bold", 14)
+            y = _new_page(c, regular_font)
+        c.setFont(bold_font, 14)
         c.drawString(margin_x, y, "Travel Tips")
         y -= 18
-        c.setFont("Helvetica", 12)
+        c.setFont(regular_font, 12)
         for tip in travel_response.travel_tips:
             y = _draw_wrapped_text(c, f"- {tip}", margin_x, y, max_text_width, line_height)
 
     if travel_response.estimated_budget:
         if y < 3 * cm:
-            c.showPage()
-            y = height - 2 * cm
+            y = _new_page(c, regular_font)
         y -= line_height
-        c.setFont("Helvetica-Bold", 12)
+        c.setFont(bold_font, 12)
         y = _draw_wrapped_text(
             c,
             f"Estimated Budget: {travel_response.estimated_budget}",
@@ -226,9 +325,8 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
 
     if travel_response.weather_info:
         if y < 3 * cm:
-            c.showPage()
-            y = height - 2 * cm
-        c.setFont("Helvetica-Bold", 12)
+            y = _new_page(c, regular_font)
+        c.setFont(bold_font, 12)
         y = _draw_wrapped_text(
             c,
             f"Weather Info: {travel_response.weather_info}",
@@ -246,3 +344,13 @@ def generate_travel_plan_pdf(travel_request: TravelRequest, travel_response: Tra
     logger.info(f"Travel plan PDF generated successfully, size={len(pdf_bytes)} bytes")
     return pdf_bytes
 
+
+async def render_travel_plan_pdf(travel_request: TravelRequest, travel_response: TravelResponse) -> bytes:
+    """
+    Render the travel plan PDF in the process pool so that reportlab's
+    CPU work does not block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_process_pool(), generate_travel_plan_pdf, travel_request, travel_response
+    )
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, List, Tuple
+
+from bson import Binary
+
+# Codec tag stored with every body so a faster codec can be introduced later
+# without rewriting existing documents
+ZLIB_CODEC = "zlib"
+_ZLIB_LEVEL = 6
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _compress(data: Any) -> Binary:
+    return Binary(zlib.compress(_dumps(data), _ZLIB_LEVEL))
+
+
+def _decompress(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def content_hash(response_data: Dict[str, Any]) -> str:
+    """sha256 of the canonical JSON of a plan response, as stored in body_hash."""
+    return hashlib.sha256(_dumps(response_data)).hexdigest()
+
+
+def encode_plan_body(response_data: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """
+    Serialize and compress a plan response for the plan_body collection.
+
+    The itinerary is stored as one compressed entry per day in `days`, so a
+    single day can be fetched with a $slice projection; the rest of the
+    response is compressed into `body`. Returns the body fields to store and
+    the sha256 content hash of the uncompressed response JSON, which is kept
+    on the summary document.
+    """
+    raw = _dumps(response_data)
+    rest = {key: value for key, value in response_data.items() if key != "itinerary"}
+    body = _compress(rest)
+    days = [_compress(day) for day in response_data.get("itinerary", [])]
+    return {
+        "codec": ZLIB_CODEC,
+        "body": body,
+        "days": days,
+        "raw_size": len(raw),
+        "compressed_size": len(body) + sum(len(day) for day in days),
+    }, hashlib.sha256(raw).hexdigest()
+
+
+def decode_plan_body(body_doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of encode_plan_body: returns the stored plan response dict."""
+    _check_codec(body_doc)
+    response_data = _decompress(body_doc["body"])
+    # bodies written before days were split out keep the itinerary in body
+    if "days" in body_doc:
+        response_data["itinerary"] = decode_plan_days(body_doc)
+    return response_data
+
+
+def decode_plan_days(body_doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Decode the (possibly $slice-projected) per-day itinerary entries of a body document."""
+    _check_codec(body_doc)
+    return [_decompress(day) for day in body_doc.get("days", [])]
+
+
+def _check_codec(body_doc: Dict[str, Any]) -> None:
+    codec = body_doc.get("codec")
+    if codec != ZLIB_CODEC:
+        raise ValueError(f"Unsupported plan body codec: {codec}")
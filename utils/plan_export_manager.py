@@ -0,0 +1,137 @@
+import csv
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pandas as pd
+
+from utils.stream_buffer import StreamBuffer
+
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+EXPORT_FORMATS = (CSV_FORMAT, PARQUET_FORMAT)
+
+# One row per activity, with the plan request and day repeated on every row
+EXPORT_COLUMNS: List[str] = [
+    "plan_id",
+    "email",
+    "location",
+    "start_date",
+    "end_date",
+    "number_of_days",
+    "language",
+    "budget_level",
+    "interests",
+    "day_number",
+    "day_date",
+    "day_title",
+    "activity_time",
+    "activity",
+    "activity_location",
+    "activity_duration",
+]
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def flatten_plan(doc: Dict[str, Any], response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a stored plan (summary document + response) into one row per activity."""
+    request_data = doc.get("request", {})
+    summary = doc.get("summary", {})
+    plan = {
+        "plan_id": str(doc.get("_id")),
+        "email": doc.get("email"),
+        "location": summary.get("location", request_data.get("location")),
+        "start_date": _to_date(summary.get("start_date", request_data.get("start_date"))),
+        "end_date": _to_date(summary.get("end_date", response_data.get("end_date"))),
+        "number_of_days": summary.get("number_of_days", request_data.get("number_of_days")),
+        "language": summary.get("language", request_data.get("preferred_language")),
+        "budget_level": request_data.get("budget_level"),
+        "interests": ",".join(request_data.get("interests") or []),
+    }
+
+    rows = []
+    for day in response_data.get("itinerary", []):
+        day_fields = {
+            "day_number": day.get("day_number"),
+            "day_date": _to_date(day.get("day_date")),
+            "day_title": day.get("title"),
+        }
+        for activity in day.get("activities", []):
+            rows.append({
+                **plan,
+                **day_fields,
+                "activity_time": activity.get("time"),
+                "activity": activity.get("activity"),
+                "activity_location": activity.get("location"),
+                "activity_duration": activity.get("duration"),
+            })
+    return rows
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("plan_id", pa.string()),
+        ("email", pa.string()),
+        ("location", pa.string()),
+        ("start_date", pa.date32()),
+        ("end_date", pa.date32()),
+        ("number_of_days", pa.int32()),
+        ("language", pa.string()),
+        ("budget_level", pa.string()),
+        ("interests", pa.string()),
+        ("day_number", pa.int32()),
+        ("day_date", pa.date32()),
+        ("day_title", pa.string()),
+        ("activity_time", pa.string()),
+        ("activity", pa.string()),
+        ("activity_location", pa.string()),
+        ("activity_duration", pa.string()),
+    ])
+
+
+async def write_rows(export_format: str, row_batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """
+    Encode batches of flattened rows as CSV or Parquet, yielding the encoded
+    bytes after every batch. Each batch becomes one pandas frame (and one
+    Parquet row group), so memory is bounded by the batch size.
+    """
+    stream = StreamBuffer()
+
+    if export_format == PARQUET_FORMAT:
+        # pyarrow is only needed for parquet exports
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _parquet_schema()
+        writer = pq.ParquetWriter(stream, schema, compression="snappy")
+        try:
+            async for rows in row_batches:
+                if not rows:
+                    continue
+                frame = pd.DataFrame(rows, columns=EXPORT_COLUMNS)
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+                yield stream.drain()
+        finally:
+            writer.close()
+        yield stream.drain()
+        return
+
+    header = True
+    async for rows in row_batches:
+        if not rows:
+            continue
+        frame = pd.DataFrame(rows, columns=EXPORT_COLUMNS)
+        yield frame.to_csv(index=False, header=header, quoting=csv.QUOTE_MINIMAL).encode("utf-8")
+        header = False
+    if header:
+        yield (",".join(EXPORT_COLUMNS) + "\n").encode("utf-8")
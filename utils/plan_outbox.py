@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, WTimeoutError
+
+from .config import settings
+from .logger import logger
+
+OutboxWriter = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+# Mongo unreachable, failing over or slow: retried until it recovers
+TRANSIENT_ERRORS = (ConnectionFailure, ExecutionTimeout, WTimeoutError)
+ENTRY_FIELDS = ("id", "email", "request", "response")
+
+
+def _plan_key(email: str, start_date: str) -> Tuple[str, str]:
+    # entries hold the mode='json' dump ("YYYY-MM-DDT00:00:00"); lookups pass date.isoformat()
+    return email, start_date[:10]
+
+
+class PlanOutbox:
+    """
+    Write-behind queue for completed travel plans.
+
+    Each entry is appended to an on-disk log and fsynced before `put`
+    returns, so a plan survives a crash between the response and the Mongo
+    write. A background task drains the in-memory queue in batches through
+    the writer callback, retries with backoff while Mongo is unavailable and
+    appends an ack line once a batch is stored. On start, entries without an
+    ack are replayed. The log is truncated whenever nothing is in flight.
+
+    Only transient Mongo errors are retried indefinitely. A batch that keeps
+    failing otherwise is split until the failing entries are isolated; those
+    are appended to `<path>.dead` with their error and acked, so one bad
+    entry cannot hold back the plans queued behind it.
+
+    Entries stay readable through `lookup` until they are acked, which gives
+    read-your-writes to the endpoints that read a single plan (/plan/json,
+    /plan/{start_date}/day/{n}, /plan/download). Listings only show a plan
+    once it is written.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.dead_letter_path = self.path.with_name(self.path.name + ".dead")
+        self._writer: Optional[OutboxWriter] = None
+        self._file = None
+        self._file_lock = asyncio.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._by_plan_key: Dict[Tuple[str, str], str] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._task is not None
+
+    async def start(self, writer: OutboxWriter) -> None:
+        if self._task is not None:
+            return
+        self._writer = writer
+        self._queue = asyncio.Queue()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        entries, unreadable = await asyncio.to_thread(self._read_unacked)
+        self._file = open(self.path, "a", encoding="utf-8")
+        for record in unreadable:
+            await self._dead_letter(record, "incomplete outbox entry")
+        for entry in entries:
+            self._track(entry)
+            self._queue.put_nowait(entry["id"])
+        if entries:
+            logger.info(f"Replaying {len(entries)} travel plan(s) from the outbox")
+
+        self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._task is None:
+            return
+        # give queued plans a chance to reach Mongo; whatever is left is replayed on the next start
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopping outbox with {len(self._pending)} plan(s) not yet written")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._file.close()
+        self._file = None
+
+    async def put(self, entry: Dict[str, Any]) -> None:
+        """Durably append a plan entry and queue it for writing. `entry` needs a str `id`."""
+        await self._append([entry])
+        self._track(entry)
+        self._queue.put_nowait(entry["id"])
+
+    def lookup(self, email: str, start_date: date) -> Optional[Dict[str, Any]]:
+        entry_id = self._by_plan_key.get(_plan_key(email, start_date.isoformat()))
+        return self._pending.get(entry_id) if entry_id else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "pending": len(self._pending)}
+
+    def _track(self, entry: Dict[str, Any]) -> None:
+        self._pending[entry["id"]] = entry
+        self._by_plan_key[_plan_key(entry["email"], entry["request"]["start_date"])] = entry["id"]
+
+    def _untrack(self, entry: Dict[str, Any]) -> None:
+        self._pending.pop(entry["id"], None)
+        plan_key = _plan_key(entry["email"], entry["request"]["start_date"])
+        if self._by_plan_key.get(plan_key) == entry["id"]:
+            del self._by_plan_key[plan_key]
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            batch_ids = [await self._queue.get()]
+            while len(batch_ids) < settings.PLAN_OUTBOX_BATCH_SIZE and not self._queue.empty():
+                batch_ids.append(self._queue.get_nowait())
+            batch = [self._pending[entry_id] for entry_id in batch_ids]
+
+            await self._write(batch)
+
+            try:
+                await self._append([{"ack": batch_ids}])
+            except Exception as e:
+                # the plans are stored; a missing ack only means a harmless replay
+                logger.error(f"Failed to ack outbox plans: {str(e)}")
+            for entry in batch:
+                self._untrack(entry)
+            for _ in batch_ids:
+                self._queue.task_done()
+            if not self._pending:
+                await self._truncate()
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Write a batch, splitting it to dead-letter the entries that keep failing"""
+        retry_delay = settings.PLAN_OUTBOX_RETRY_DELAY_SECONDS
+        attempts = 0
+        while True:
+            try:
+                await self._writer(batch)
+                return
+            except TRANSIENT_ERRORS as e:
+                logger.error(f"Failed to write {len(batch)} outbox plan(s), retrying in {retry_delay}s: {str(e)}")
+            except Exception as e:
+                attempts += 1
+                if attempts >= settings.PLAN_OUTBOX_MAX_ATTEMPTS:
+                    if len(batch) == 1:
+                        await self._dead_letter(batch[0], f"{type(e).__name__}: {str(e)}")
+                        return
+                    middle = len(batch) // 2
+                    await self._write(batch[:middle])
+                    await self._write(batch[middle:])
+                    return
+                logger.error(
+                    f"Failed to write {len(batch)} outbox plan(s) (attempt {attempts}/{settings.PLAN_OUTBOX_MAX_ATTEMPTS}), "
+                    f"retrying in {retry_delay}s: {str(e)}"
+                )
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, settings.PLAN_OUTBOX_MAX_RETRY_DELAY_SECONDS)
+
+    async def _dead_letter(self, record: Dict[str, Any], error: str) -> None:
+        logger.error(f"Moving outbox plan {record.get('id')} to {self.dead_letter_path}: {error}")
+        line = json.dumps(
+            {"entry": record, "error": error, "failed_at": datetime.now(timezone.utc).isoformat()},
+            separators=(",", ":"),
+        ) + "\n"
+        await asyncio.to_thread(self._append_dead_letter, line)
+
+    def _append_dead_letter(self, line: str) -> None:
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _append(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        async with self._file_lock:
+            await asyncio.to_thread(self._write_and_sync, lines)
+
+    def _write_and_sync(self, lines: str) -> None:
+        self._file.write(lines)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    async def _truncate(self) -> None:
+        async with self._file_lock:
+            if not self._pending:
+                await asyncio.to_thread(self._file.truncate, 0)
+
+    def _read_unacked(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return the unacked entries, and the records too incomplete to replay"""
+        if not self.path.exists():
+            return [], []
+        entries: Dict[str, Dict[str, Any]] = {}
+        unreadable: List[Dict[str, Any]] = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # a torn last line from a crash mid-append; its put never returned
+                    logger.warning("Skipping unreadable outbox line")
+                    continue
+                if not isinstance(record, dict):
+                    unreadable.append({"record": record})
+                elif "ack" in record:
+                    for entry_id in record["ack"]:
+                        entries.pop(entry_id, None)
+                elif any(field not in record for field in ENTRY_FIELDS):
+                    unreadable.append(record)
+                else:
+                    entries[record["id"]] = record
+        return list(entries.values()), unreadable
+
+
+#global instance
+plan_outbox = PlanOutbox(settings.PLAN_OUTBOX_PATH)
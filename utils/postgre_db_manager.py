@@ -1,47 +1,158 @@
-from databases import Database
+import asyncpg
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from .config import settings
 from .logger import logger
-from typing import Dict,Optional,Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+
+_NAMED_PARAM = re.compile(r"(?<!:):([A-Za-z_][A-Za-z0-9_]*)")
+
+# recent pool acquire waits kept for the percentile in pool_stats
+ACQUIRE_SAMPLES = 1000
+
+
+@lru_cache(maxsize=256)
+def _compile_query(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Rewrite :name placeholders to asyncpg's positional $n once per query
+    text. Returns the rewritten SQL and the parameter names in order.
+    """
+    names: List[str] = []
+
+    def to_positional(match: re.Match) -> str:
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return _NAMED_PARAM.sub(to_positional, query), tuple(names)
+
 
 class PostgreDbManager:
+    """
+    asyncpg connection pool. Queries keep the :named parameter style; the
+    rewrite to $n is cached per query text, and asyncpg keeps a prepared
+    statement per query on each connection, so the fixed auth queries are
+    parsed and planned once per connection instead of on every call.
+    """
+
     def __init__(self):
-        self.database = None
+        self.pool: Optional[asyncpg.Pool] = None
+        self._acquire_count = 0
+        self._acquire_total_ms = 0.0
+        self._acquire_max_ms = 0.0
+        self._acquire_samples: deque = deque(maxlen=ACQUIRE_SAMPLES)
 
-    async def connect(self):
+    async def connect(self, dsn: Optional[str] = None):
         try:
             logger.info(f"Connecting to Postgre database:{settings.POSTGRE_DATABASE}")
-            if not self.database:
-                self.database = Database(settings.postgre_db_url)
-            await self.database.connect()
+            if not self.pool:
+                connection_options = {"dsn": dsn} if dsn else {
+                    "host": settings.POSTGRE_HOST,
+                    "port": settings.POSTGRE_PORT,
+                    "user": settings.POSTGRE_USER,
+                    "password": settings.POSTGRE_PASSWORD,
+                    "database": settings.POSTGRE_DATABASE,
+                }
+                self.pool = await asyncpg.create_pool(
+                    **connection_options,
+                    min_size=settings.POSTGRE_POOL_MIN_SIZE,
+                    max_size=settings.POSTGRE_POOL_MAX_SIZE,
+                    max_queries=settings.POSTGRE_CONN_MAX_QUERIES,
+                    max_inactive_connection_lifetime=settings.POSTGRE_CONN_MAX_INACTIVE_LIFETIME_SECONDS,
+                    statement_cache_size=settings.POSTGRE_STATEMENT_CACHE_SIZE,
+                    server_settings={"statement_timeout": str(settings.POSTGRE_STATEMENT_TIMEOUT_MS)},
+                )
         except Exception as e:
             logger.error(f"Failed to connect to Postgre: {str(e)}")
             raise
 
     async def disconnect(self):
-        if self.database:
-            await self.database.disconnect()
-            self.database = None
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
             logger.info("PostGre connection closed")
 
     async def health_check(self) -> bool:
         try:
-            if self.database:
-                await self.database.fetch_val("SELECT 1")
+            if self.pool:
+                async with self._acquire() as connection:
+                    await connection.fetchval("SELECT 1")
                 return True
             return False
         except Exception as e:
             logger.error(f"PostgreSQL health check failed: {str(e)}")
             return False
 
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        started = time.perf_counter()
+        async with self.pool.acquire() as connection:
+            waited_ms = (time.perf_counter() - started) * 1000
+            self._acquire_count += 1
+            self._acquire_total_ms += waited_ms
+            self._acquire_max_ms = max(self._acquire_max_ms, waited_ms)
+            self._acquire_samples.append(waited_ms)
+            yield connection
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        A pooled connection inside a transaction, for work that needs one
+        session: temp tables, COPY. Queries on it use asyncpg's $n placeholders.
+        """
+        async with self._acquire() as connection:
+            async with connection.transaction():
+                yield connection
+
+    def pool_stats(self) -> Dict[str, Any]:
+        if self.pool is None:
+            return {}
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        samples = sorted(self._acquire_samples)
+        return {
+            "open": size,
+            "in_use": size - idle,
+            "available": idle,
+            "max_size": self.pool.get_max_size(),
+            "acquire": {
+                "count": self._acquire_count,
+                "avg_ms": round(self._acquire_total_ms / self._acquire_count, 3) if self._acquire_count else None,
+                "p99_ms": round(samples[int(len(samples) * 0.99)], 3) if samples else None,
+                "max_ms": round(self._acquire_max_ms, 3),
+            },
+        }
+
+    def _bind(self, query: str, values: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        sql, names = _compile_query(query)
+        values = values or {}
+        return sql, [values[name] for name in names]
+
     async def execute(self,query:str, values: Optional[Dict[str,Any]] = None):
-        await self.database.execute(query=query, values=values)
+        sql, args = self._bind(query, values)
+        async with self._acquire() as connection:
+            return await connection.execute(sql, *args)
 
     async def fetch_one(self,query:str, values: Optional[Dict[str,Any]] = None):
-        return await self.database.fetch_one(query=query, values=values)
+        sql, args = self._bind(query, values)
+        async with self._acquire() as connection:
+            return await connection.fetchrow(sql, *args)
 
     async def fetch_all(self,query:str,values: Optional[Dict[str,Any]] = None):
-        return await self.database.fetch_all(query=query, values=values)
+        sql, args = self._bind(query, values)
+        async with self._acquire() as connection:
+            return await connection.fetch(sql, *args)
+
+    async def iterate(self, query: str, values: Optional[Dict[str, Any]] = None, prefetch: int = 1000) -> AsyncIterator[asyncpg.Record]:
+        """Stream rows through a server-side cursor, holding at most `prefetch` rows in memory"""
+        sql, args = self._bind(query, values)
+        async with self.transaction() as connection:
+            async for record in connection.cursor(sql, *args, prefetch=prefetch):
+                yield record
 
 #global instance
 postgre_manager = PostgreDbManager()
-
@@ -0,0 +1,25 @@
+import io
+
+
+class StreamBuffer(io.RawIOBase):
+    """
+    Write-only, non-seekable sink for writers that expect a file object
+    (zipfile, csv, parquet). Bytes accumulate until drain() hands them to
+    a streaming response, so only the data written since the last drain
+    is held in memory.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk